@@ -0,0 +1,513 @@
+from bst import BSTNode, RepInvariantError
+
+
+def height(node):
+    """Returns the height of node; -1 for an empty subtree."""
+    if node is None:
+        return -1
+    return node.height
+
+
+def size(node):
+    """Returns the number of nodes in the subtree rooted at node; 0 for an empty subtree."""
+    if node is None:
+        return 0
+    return node.size
+
+
+def update(node):
+    """Recomputes the height and the size of node from its children."""
+    node.height = max(height(node.left), height(node.right)) + 1
+    node.size = size(node.left) + size(node.right) + 1
+
+
+def check_node(node):
+    """Checks the height, the size and the balance of node (the per-node part of the
+    representation invariant shared by AVL and PersistentAVL)."""
+    left, right = height(node.left), height(node.right)
+    if node.height != max(left, right) + 1:
+        raise RepInvariantError('Incorrect height.')
+    if node.size != size(node.left) + size(node.right) + 1:
+        raise RepInvariantError('Incorrect size.')
+    if abs(left - right) > 1:
+        raise RepInvariantError('Unbalanced node.')
+
+
+def max_node(node):
+    """Returns the node with the largest key in the subtree rooted at node."""
+    while node.right is not None:
+        node = node.right
+    return node
+
+
+def _detach(node):
+    """Makes node the root of a standalone subtree; returns node."""
+    if node is not None:
+        node.parent = None
+    return node
+
+
+def _join(left, mid, right):
+    """Joins AVL subtrees left and right (standalone roots, possibly None) with a detached node mid
+    whose key lies between their keys; returns the root of the resulting AVL tree.
+
+    Takes O(|height(left) - height(right)| + 1) time.
+    """
+    mid.parent = None
+    tree = AVL()
+    if height(left) > height(right) + 1:
+        tree.root = parent = left
+        while height(parent.right) > height(right) + 1:  # descend the right spine of left
+            parent = parent.right
+        mid.left, mid.right = parent.right, right
+        parent.right = mid
+    elif height(right) > height(left) + 1:
+        tree.root = parent = right
+        while height(parent.left) > height(left) + 1:
+            parent = parent.left
+        mid.left, mid.right = left, parent.left
+        parent.left = mid
+    else:
+        mid.left, mid.right = left, right
+        parent = None
+        tree.root = mid
+    mid.parent = parent
+    if mid.left is not None:
+        mid.left.parent = mid
+    if mid.right is not None:
+        mid.right.parent = mid
+    update(mid)
+    tree._rebalance_all(parent)
+    return tree.root
+
+
+def sorted_items(keys, values=None):
+    """Returns keys and values as lists after checking that keys are strictly increasing.
+
+    Raises:
+        ValueError if keys are not strictly increasing or values do not match keys.
+    """
+    keys = list(keys)
+    values = [None] * len(keys) if values is None else list(values)
+    if len(values) != len(keys):
+        raise ValueError('Number of values does not match number of keys.')
+    for i in range(1, len(keys)):
+        if not keys[i - 1] < keys[i]:
+            if not keys[i] < keys[i - 1]:
+                raise ValueError('Duplicate key {!r}: keys are not strictly increasing.'.format(keys[i]))
+            raise ValueError('Keys are not strictly increasing.')
+    return keys, values
+
+
+def build_balanced(keys, values, make_node):
+    """Builds a perfectly balanced tree from sorted keys and values in O(n) time.
+
+    Args:
+        keys: List of strictly increasing keys.
+        values: List of the corresponding values.
+        make_node: Function (key, value, left, right) -> node creating a node with the given
+            subtrees (None for an empty subtree).
+    Returns:
+        The root node; None if keys is empty.
+    """
+
+    def build(lo, hi):  # builds the subtree of keys[lo:hi]; recursion depth is O(log n)
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        return make_node(keys[mid], values[mid], build(lo, mid), build(mid + 1, hi))
+
+    return build(0, len(keys))
+
+
+class OrderedMapMixin(object):
+    """Read-only ordered-map methods shared by AVL and PersistentAVL: the tree provides
+    root and find(key), and its nodes have key, value, left, right and size."""
+
+    __slots__ = ()
+
+    def __len__(self):
+        return size(self.root)
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    def __getitem__(self, key):
+        node = self.find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __iter__(self):
+        """Iterates over the keys in sorted order."""
+        for node in self.irange():
+            yield node.key
+
+    def get(self, key, default=None):
+        """Returns the value of key; default if key is not in the tree."""
+        node = self.find(key)
+        return default if node is None else node.value
+
+    def items(self):
+        """Iterates over (key, value) pairs in sorted order."""
+        for node in self.irange():
+            yield node.key, node.value
+
+    def height(self):
+        """Returns the height of the tree; -1 if the tree is empty."""
+        return height(self.root)
+
+    def irange(self, lo=None, hi=None):
+        """Yields the nodes with lo <= key <= hi in sorted order (None means unbounded).
+
+        Takes O(log n + k) time for k yielded nodes; the tree must not be modified meanwhile
+        (nodes of a PersistentAVL are never modified, so its versions can always be iterated).
+        """
+        stack = []
+        current = self.root
+        while current is not None:  # path to the first key not smaller than lo
+            if lo is not None and current.key < lo:
+                current = current.right
+            else:
+                stack.append(current)
+                current = current.left
+        while stack:
+            node = stack.pop()
+            if hi is not None and hi < node.key:
+                return
+            yield node
+            current = node.right
+            while current is not None:
+                stack.append(current)
+                current = current.left
+
+
+class AVLNode(BSTNode):
+    """A node in an AVL tree.
+
+    Attributes:
+        value: Value associated with the key.
+        height: Height of the subtree rooted at this node (a leaf has height 0).
+        size: Number of nodes in the subtree rooted at this node.
+    """
+
+    def __init__(self, key, value=None):
+        """Inits AVLNode with key and value."""
+        BSTNode.__init__(self, key)
+        self.value = value
+        self.height = 0
+        self.size = 1
+
+    def check_node_ri(self):
+        """Subroutine in check_ri(). Checks the height, the size and the balance of this node."""
+        check_node(self)
+
+
+class AVL(OrderedMapMixin):
+    """An implementation of an AVL tree: a BST whose subtree heights differ by at most one
+    at every node. It is used as an ordered map (key -> value); all operations are iterative
+    and take O(log n) time.
+
+    Attributes:
+        root: The root node; None if the tree is empty.
+    """
+
+    def __init__(self):
+        """Creates an empty AVL tree."""
+        self.root = None
+
+    @classmethod
+    def from_sorted(cls, keys, values=None):
+        """Builds a perfectly balanced tree from strictly increasing keys in O(n) time.
+
+        Args:
+            keys: Iterable of strictly increasing keys.
+            values: Iterable of the corresponding values (optional).
+        Raises:
+            ValueError if keys are not strictly increasing or values do not match keys.
+        """
+        keys, values = sorted_items(keys, values)
+
+        def make_node(key, value, left, right):
+            node = AVLNode(key, value)
+            node.left, node.right = left, right
+            if left is not None:
+                left.parent = node
+            if right is not None:
+                right.parent = node
+            update(node)
+            return node
+
+        tree = cls()
+        tree.root = build_balanced(keys, values, make_node)
+        return tree
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if self.delete(key) is None:
+            raise KeyError(key)
+
+    def find(self, key):
+        """Returns the node with the specified key; None if there is no such node."""
+        return self.root and self.root.find(key)
+
+    def find_min(self):
+        """Returns the node with the smallest key; None if the tree is empty."""
+        return self.root and self.root.find_min()
+
+    def next_larger(self, key):
+        """Returns the node with the smallest key larger than key, which has to be in the tree."""
+        node = self.find(key)
+        return node and node.next_larger()
+
+    def floor(self, key):
+        """Returns the node with the largest key not larger than key; None if there is no such node."""
+        current = self.root
+        result = None
+        while current is not None:
+            if key < current.key:
+                current = current.left
+            else:
+                result = current
+                if not current.key < key:
+                    break
+                current = current.right
+        return result
+
+    def ceiling(self, key):
+        """Returns the node with the smallest key not smaller than key; None if there is no such node."""
+        current = self.root
+        result = None
+        while current is not None:
+            if current.key < key:
+                current = current.right
+            else:
+                result = current
+                if not key < current.key:
+                    break
+                current = current.left
+        return result
+
+    def rank(self, key):
+        """Returns the number of keys smaller than key."""
+        current = self.root
+        result = 0
+        while current is not None:
+            if current.key < key:
+                result += size(current.left) + 1
+                current = current.right
+            else:
+                current = current.left
+        return result
+
+    def select(self, k):
+        """Returns the node with the k-th smallest key (zero-based).
+
+        Raises:
+            IndexError if k is out of range.
+        """
+        if not 0 <= k < len(self):
+            raise IndexError('select index out of range')
+        current = self.root
+        while True:
+            left_size = size(current.left)
+            if k < left_size:
+                current = current.left
+            elif k == left_size:
+                return current
+            else:
+                k -= left_size + 1
+                current = current.right
+
+    def insert(self, key, value=None):
+        """Inserts key with value into the tree; overwrites the value if key is already there.
+
+        Returns:
+            The node holding key.
+        """
+        current = self.root
+        if current is None:
+            self.root = AVLNode(key, value)
+            return self.root
+        while True:
+            if key < current.key:
+                if current.left is None:
+                    node = current.left = AVLNode(key, value)
+                    break
+                current = current.left
+            elif current.key < key:
+                if current.right is None:
+                    node = current.right = AVLNode(key, value)
+                    break
+                current = current.right
+            else:
+                current.value = value
+                return current
+        node.parent = current
+        self._rebalance(current, 1)
+        return node
+
+    def delete(self, key):
+        """Removes key from the tree.
+
+        Returns:
+            The detached node holding key; None if key is not in the tree.
+        """
+        node = self.find(key)
+        if node is None:
+            return None
+        if node.left is not None and node.right is not None:
+            successor = node.right.find_min()
+            node.key, successor.key = successor.key, node.key
+            node.value, successor.value = successor.value, node.value
+            node = successor
+        child = node.left or node.right
+        parent = node.parent
+        if child is not None:
+            child.parent = parent
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        node.parent = node.left = node.right = None
+        node.height, node.size = 0, 1
+        self._rebalance(parent, -1)
+        return node
+
+    def join(self, other):
+        """Moves all keys of other, which have to be larger than all keys of this tree, into
+        this tree in O(log n) time; other becomes empty.
+
+        Raises:
+            ValueError if the key ranges of the trees overlap.
+        """
+        if other.root is None:
+            return
+        if self.root is None:
+            self.root, other.root = other.root, None
+            return
+        mid = other.find_min()
+        if not max_node(self.root).key < mid.key:
+            raise ValueError('Keys of the joined tree have to be larger than keys of this tree.')
+        other.delete(mid.key)
+        self.root = _join(self.root, mid, other.root)
+        other.root = None
+
+    def split(self, key):
+        """Splits this tree in O(log n) time into two trees; this tree becomes empty.
+
+        Returns:
+            A pair of trees (left, right): keys smaller than key and keys not smaller than key.
+        """
+        smaller = []  # nodes on the search path with keys smaller than key, top-down
+        larger = []
+        current = self.root
+        while current is not None:
+            if current.key < key:
+                smaller.append(current)
+                current = current.right
+            else:
+                larger.append(current)
+                current = current.left
+        self.root = None
+        left_root = None
+        for node in reversed(smaller):  # each node is joined with its own left subtree
+            left_root = _join(_detach(node.left), node, left_root)
+        right_root = None
+        for node in reversed(larger):
+            right_root = _join(right_root, node, _detach(node.right))
+        left, right = AVL(), AVL()
+        left.root, right.root = left_root, right_root
+        return left, right
+
+    def _rebalance_all(self, node):
+        """Recomputes heights and sizes and restores the AVL property on the whole path
+        from node to the root (used when a subtree of arbitrary size was attached below node)."""
+        while node is not None:
+            left, right = height(node.left), height(node.right)
+            if left >= right + 2:
+                if height(node.left.left) < height(node.left.right):
+                    self._left_rotate(node.left)
+                self._right_rotate(node)
+                node = node.parent
+            elif right >= left + 2:
+                if height(node.right.right) < height(node.right.left):
+                    self._right_rotate(node.right)
+                self._left_rotate(node)
+                node = node.parent
+            else:
+                update(node)
+            node = node.parent
+
+    def _replace_child(self, parent, old, new):
+        """Puts new in the place of parent's child old."""
+        new.parent = parent
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _left_rotate(self, x):
+        y = x.right
+        self._replace_child(x.parent, x, y)
+        x.right = y.left
+        if x.right is not None:
+            x.right.parent = x
+        y.left = x
+        x.parent = y
+        update(x)
+        update(y)
+
+    def _right_rotate(self, x):
+        y = x.left
+        self._replace_child(x.parent, x, y)
+        x.left = y.right
+        if x.left is not None:
+            x.left.parent = x
+        y.right = x
+        x.parent = y
+        update(x)
+        update(y)
+
+    def _rebalance(self, node, delta):
+        """Restores heights, sizes and the AVL property on the path from node to the root
+        after a single key was added (delta = 1) or removed (delta = -1) below node."""
+        while node is not None:
+            left, right = height(node.left), height(node.right)
+            if left >= right + 2:
+                if height(node.left.left) < height(node.left.right):
+                    self._left_rotate(node.left)
+                self._right_rotate(node)
+                node = node.parent
+            elif right >= left + 2:
+                if height(node.right.right) < height(node.right.left):
+                    self._right_rotate(node.right)
+                self._left_rotate(node)
+                node = node.parent
+            else:
+                new_height = max(left, right) + 1
+                node.size += delta
+                if node.height == new_height:
+                    # heights of the ancestors do not change either, only their sizes do
+                    node = node.parent
+                    while node is not None:
+                        node.size += delta
+                        node = node.parent
+                    return
+                node.height = new_height
+            node = node.parent
+
+    def check_ri(self):
+        """Checks the representation invariant of the AVL tree (BST order, parent pointers,
+        heights, sizes, balance) in O(n) time."""
+        if self.root is None:
+            return
+        if self.root.parent is not None:
+            raise RepInvariantError('Root has a parent.')
+        self.root.check_ri()
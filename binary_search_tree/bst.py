@@ -30,18 +30,19 @@ class BSTNode(object):
 
     def insert(self, node):
         """Inserts node into the subtree rooted at this node."""
-        if self.key > node.key: 
-            if self.left is None: 
-                self.left = node 
-                node.parent = self 
-            else: 
-                self.left.insert(node) 
-        else:
-            if self.right is None: 
-                self.right = node 
-                node.parent = self 
-            else: 
-                self.right.insert(node)
+        current = self
+        while True:
+            if current.key > node.key:
+                if current.left is None:
+                    current.left = node
+                    break
+                current = current.left
+            else:
+                if current.right is None:
+                    current.right = node
+                    break
+                current = current.right
+        node.parent = current
 
     def find_min(self):
         """Returns a node with the smallest key in the subtree rooted at this node."""
@@ -61,18 +62,15 @@ class BSTNode(object):
 
     def find(self, key):
         """Returns node with the specified key from the subtree rooted at this node."""
-        if self.key == key:
-            return self
-        elif self.key > key:
-            if self.left is None:
-                return None 
-            else:
-                return self.left.find(key)
-        else:
-            if self.right is None:
-                return None 
+        current = self
+        while current is not None:
+            if current.key == key:
+                return current
+            elif current.key > key:
+                current = current.left
             else:
-                return self.right.find(key)
+                current = current.right
+        return None
 
     def delete(self):
         """Removes this node from the BST; returns nothing"""
@@ -91,33 +89,28 @@ class BSTNode(object):
             self.key, node.key = node.key, self.key 
             node.delete()
 
-    def check_ri_left_helper(self, key):
-        """Subroutine in check_ri(). Checks if the keys of all children are not bigger than key."""
-        if self.key > key:
-            raise RepInvariantError('Key of a left child bigger than key of an ancestor.')
-        if self.left is not None:
-            self.left.check_ri_left_helper(key)
-        if self.right is not None:
-            self.right.check_ri_left_helper(key)
-
-    def check_ri_right_helper(self, key):
-        """Subroutine in check_ri(). Checks if the keys of all children are not smaller than key."""
-        if self.key < key:
-            raise RepInvariantError('Key of a right child smaller than key of an ancestor.')
-        if self.left is not None:
-            self.left.check_ri_right_helper(key)
-        if self.right is not None:
-            self.right.check_ri_right_helper(key)
+    def check_node_ri(self):
+        """Subroutine in check_ri(). Checks the metadata stored at this node (none for a plain BST)."""
+        pass
 
     def check_ri(self):
-        """Checks the representation invariant of BST."""
-        if self.left is not None:
-            if self.left.parent is not self:
-                raise RepInvariantError('Incorrect parent pointer of left child.')
-            self.left.check_ri_left_helper(self.key)
-            self.left.check_ri()
-        if self.right is not None:
-            if self.right.parent is not self:
-                raise RepInvariantError('Incorrect parent pointer of right child.')
-            self.right.check_ri_right_helper(self.key)
-            self.right.check_ri()
+        """Checks the representation invariant of the BST rooted at this node in a single
+        iterative pass (O(n) time): every key has to lie within the bounds set by its
+        ancestors, every child has to point back to its parent and every node has to pass
+        check_node_ri()."""
+        stack = [(self, None, None)]  # node, lower bound, upper bound (None if unbounded)
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi is not None and node.key > hi:
+                raise RepInvariantError('Key of a left child bigger than key of an ancestor.')
+            if lo is not None and node.key < lo:
+                raise RepInvariantError('Key of a right child smaller than key of an ancestor.')
+            node.check_node_ri()
+            if node.left is not None:
+                if node.left.parent is not node:
+                    raise RepInvariantError('Incorrect parent pointer of left child.')
+                stack.append((node.left, lo, node.key))
+            if node.right is not None:
+                if node.right.parent is not node:
+                    raise RepInvariantError('Incorrect parent pointer of right child.')
+                stack.append((node.right, node.key, hi))
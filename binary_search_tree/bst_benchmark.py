@@ -0,0 +1,68 @@
+"""
+
+Benchmark of sorted-key insertion (e.g. timestamps) into BSTNode and AVL
+
+Sorted input degenerates BSTNode into a linked list (O(n^2) total), so BSTNode is
+only run up to --bst-limit keys; AVL is run at the full --n, both by repeated
+insertion and by the O(n) bulk load AVL.from_sorted.
+
+Usage: python bst_benchmark.py [--n N] [--bst-limit M]
+
+"""
+
+import argparse
+import random
+import time
+
+import avl
+import bst
+
+
+def bench_bst(keys):
+    """Inserts keys into a BSTNode tree; returns (insert seconds, find seconds, root)."""
+    start = time.perf_counter()
+    root = bst.BSTNode(keys[0])
+    for key in keys[1:]:
+        root.insert(bst.BSTNode(key))
+    insert_time = time.perf_counter() - start
+    probes = random.Random(0).sample(keys, min(len(keys), 10000))
+    start = time.perf_counter()
+    for key in probes:
+        root.find(key)
+    return insert_time, (time.perf_counter() - start) / len(probes), root
+
+
+def bench_avl(keys):
+    """Inserts keys into an AVL tree; returns (insert seconds, find seconds, tree)."""
+    start = time.perf_counter()
+    tree = avl.AVL()
+    for key in keys:
+        tree.insert(key)
+    insert_time = time.perf_counter() - start
+    probes = random.Random(0).sample(keys, min(len(keys), 10000))
+    start = time.perf_counter()
+    for key in probes:
+        tree.find(key)
+    return insert_time, (time.perf_counter() - start) / len(probes), tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=1000000)
+    parser.add_argument('--bst-limit', type=int, default=10000)
+    args = parser.parse_args()
+    m = min(args.n, args.bst_limit)
+    insert_time, find_time, root = bench_bst(list(range(m)))
+    print('BSTNode {:>9} sorted keys: insert {:8.3f} s, find {:8.2f} us, height {}'.format(
+        m, insert_time, find_time * 1e6, m - 1))
+    insert_time, find_time, tree = bench_avl(list(range(args.n)))
+    print('AVL     {:>9} sorted keys: insert {:8.3f} s, find {:8.2f} us, height {}'.format(
+        args.n, insert_time, find_time * 1e6, tree.height()))
+    start = time.perf_counter()
+    tree = avl.AVL.from_sorted(range(args.n))
+    print('AVL     {:>9} sorted keys: from_sorted {:8.3f} s, height {}'.format(
+        args.n, time.perf_counter() - start, tree.height()))
+
+
+if __name__ == '__main__':
+    main()
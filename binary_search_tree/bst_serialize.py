@@ -0,0 +1,164 @@
+"""
+
+Compact binary serialization of BST indexes with numeric keys (and values)
+
+Keys are written in sorted order, so a file is reloaded with the linear-time balanced
+construction from_sorted() instead of one insert per key. Format (little-endian header):
+
+    header: magic b'BSTS', version (1 byte), byte order (b'<' or b'>'),
+            key typecode, value typecode (b'-' if there are no values)
+    chunks: uint32 count n, then n keys and n values as raw array.array bytes
+    end:    uint32 count 0
+
+Writing and reading proceed chunk by chunk, so dump() accepts any sorted iterable (e.g.
+a generator merging several sources) and iter_load() streams files larger than memory.
+
+"""
+
+import struct
+import sys
+from array import array
+from itertools import islice
+
+import avl
+from bst import BSTNode
+from sorted_blocks import SortedBlockList
+
+MAGIC = b'BSTS'
+VERSION = 1
+HEADER = struct.Struct('<4sBccc')
+COUNT = struct.Struct('<I')
+NO_VALUES = b'-'
+BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+
+def iter_sorted(source):
+    """Yields the nodes of a tree in sorted order.
+
+    Args:
+        source: An AVL or PersistentAVL tree (anything with irange()) or a BSTNode root.
+    """
+    if isinstance(source, BSTNode):
+        node = source.find_min()
+        while node is not None:
+            yield node
+            node = node.next_larger()
+    else:
+        for node in source.irange():
+            yield node
+
+
+def dump(source, f, key_type='q', value_type=None, chunk_size=65536):
+    """Writes a tree (or a sorted iterable) to a binary file object.
+
+    Args:
+        source: A tree accepted by iter_sorted(), a SortedBlockList (keys only), or an
+            iterable of sorted keys ((key, value) pairs if value_type is given).
+        f: File object opened for binary writing.
+        key_type: array typecode of the keys, e.g. 'q' (int64) or 'd' (double).
+        value_type: array typecode of the values; None to store keys only.
+        chunk_size: Number of keys per chunk.
+    Returns:
+        Number of keys written.
+    Raises:
+        ValueError if value_type is given but source stores keys only (a SortedBlockList or
+        a BSTNode tree).
+    """
+    if isinstance(source, SortedBlockList):
+        if value_type is not None:
+            raise ValueError('SortedBlockList stores keys only; dump it without value_type.')
+        items = iter(source)
+    elif isinstance(source, BSTNode) or hasattr(source, 'irange'):
+        if value_type is not None and isinstance(source, BSTNode) and not hasattr(source, 'value'):
+            raise ValueError('BSTNode trees store keys only; dump them without value_type.')
+        if value_type is None:
+            items = (node.key for node in iter_sorted(source))
+        else:
+            items = ((node.key, node.value) for node in iter_sorted(source))
+    else:
+        items = iter(source)
+    f.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER,
+                        key_type.encode(), NO_VALUES if value_type is None else value_type.encode()))
+    total = 0
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            break
+        if value_type is None:
+            keys = array(key_type, chunk)
+            f.write(COUNT.pack(len(keys)))
+            f.write(keys.tobytes())
+        else:
+            keys = array(key_type, [key for key, _ in chunk])
+            values = array(value_type, [value for _, value in chunk])
+            f.write(COUNT.pack(len(keys)))
+            f.write(keys.tobytes())
+            f.write(values.tobytes())
+        total += len(chunk)
+    f.write(COUNT.pack(0))
+    return total
+
+
+def _read_exactly(f, n):
+    data = f.read(n)
+    if len(data) != n:
+        raise ValueError('Truncated BST file.')
+    return data
+
+
+def iter_load(f):
+    """Reads a file written by dump() chunk by chunk.
+
+    Yields:
+        Pairs (keys, values) of array.array chunks; values is None if no values were stored.
+    Raises:
+        ValueError if the file is not in the expected format.
+    """
+    magic, version, byte_order, key_type, value_type = HEADER.unpack(_read_exactly(f, HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a BST file (or unsupported version).')
+    swap = byte_order != BYTE_ORDER
+    key_type = key_type.decode()
+    value_type = None if value_type == NO_VALUES else value_type.decode()
+    while True:
+        (n,) = COUNT.unpack(_read_exactly(f, COUNT.size))
+        if n == 0:
+            return
+        keys = array(key_type)
+        keys.frombytes(_read_exactly(f, n * keys.itemsize))
+        values = None
+        if value_type is not None:
+            values = array(value_type)
+            values.frombytes(_read_exactly(f, n * values.itemsize))
+        if swap:
+            keys.byteswap()
+            if values is not None:
+                values.byteswap()
+        yield keys, values
+
+
+def load(f, tree_class=avl.AVL):
+    """Reads a file written by dump() into a balanced tree in linear time.
+
+    Args:
+        f: File object opened for binary reading.
+        tree_class: Class with a from_sorted(keys, values) constructor: AVL or PersistentAVL,
+            or SortedBlockList for files of keys only that may repeat (a BSTNode tree allows
+            duplicate keys, and dump() writes them as they are).
+    Returns:
+        The tree.
+    Raises:
+        ValueError if the file repeats a key and tree_class is a map (AVL or PersistentAVL).
+    """
+    keys = None
+    values = None
+    for chunk_keys, chunk_values in iter_load(f):
+        if keys is None:
+            keys, values = chunk_keys, chunk_values
+        else:
+            keys.extend(chunk_keys)
+            if values is not None:
+                values.extend(chunk_values)
+    if keys is None:
+        return tree_class()
+    return tree_class.from_sorted(keys, values)
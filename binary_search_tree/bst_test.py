@@ -0,0 +1,278 @@
+import io
+import random
+import unittest
+import avl
+import bst
+import bst_serialize
+import persistent_avl
+import sorted_blocks
+
+
+class SimpleCasesBST(unittest.TestCase):
+
+    def test_bst_sorted_insert(self):
+        """Tests that iterative BSTNode.insert/find handle a degenerate (linked-list) tree"""
+        root = bst.BSTNode(0)
+        for key in range(1, 5000):
+            root.insert(bst.BSTNode(key))
+        self.assertEqual(root.find(4999).key, 4999)
+        self.assertIsNone(root.find(5000))
+        self.assertEqual(root.find(2500).next_larger().key, 2501)
+        root.check_ri()
+
+    def test_check_ri_violations(self):
+        """Tests that check_ri detects order, parent pointer and metadata violations"""
+        root = bst.BSTNode(10)
+        for key in (5, 15, 3, 7, 12, 20):
+            root.insert(bst.BSTNode(key))
+        root.check_ri()
+        node = root.find(7)
+        node.key = 11  # left subtree of the root, but larger than the root
+        self.assertRaises(bst.RepInvariantError, root.check_ri)
+        node.key = 7
+        node = root.find(12)
+        node.key = 9  # right subtree of the root, but smaller than the root
+        self.assertRaises(bst.RepInvariantError, root.check_ri)
+        node.key = 12
+        root.check_ri()
+        root.find(20).parent = root
+        self.assertRaises(bst.RepInvariantError, root.check_ri)
+        tree = avl.AVL.from_sorted(range(100))
+        tree.check_ri()
+        tree.find(42).size += 1
+        self.assertRaises(bst.RepInvariantError, tree.check_ri)
+        tree.find(42).size -= 1
+        tree.find(42).height += 1
+        self.assertRaises(bst.RepInvariantError, tree.check_ri)
+
+    def test_avl_sorted_insert(self):
+        """Tests that AVL stays balanced when keys are inserted in sorted order"""
+        tree = avl.AVL()
+        n = 2 ** 12
+        for key in range(n):
+            tree.insert(key)
+        tree.check_ri()
+        self.assertEqual(len(tree), n)
+        self.assertLessEqual(tree.height(), 1.44 * 12)
+        self.assertEqual(tree.find_min().key, 0)
+        self.assertEqual(tree.next_larger(41).key, 42)
+        self.assertIsNone(tree.next_larger(n - 1))
+
+    def test_avl_random_operations(self):
+        """Tests AVL insert/find/delete against a set"""
+        rng = random.Random(0)
+        tree = avl.AVL()
+        keys = set()
+        for i in range(3000):
+            key = rng.randrange(500)
+            if rng.random() < 0.6:
+                self.assertEqual(tree.insert(key).key, key)
+                keys.add(key)
+            else:
+                node = tree.delete(key)
+                self.assertEqual(node is not None, key in keys)
+                keys.discard(key)
+            self.assertEqual(tree.find(key) is not None, key in keys)
+            if i % 100 == 0:
+                tree.check_ri()
+        tree.check_ri()
+        self.assertEqual(len(tree), len(keys))
+        for key in sorted(keys):
+            tree.delete(key)
+        self.assertIsNone(tree.root)
+        tree.check_ri()
+
+    def test_avl_ordered_map(self):
+        """Tests the ordered-map API of AVL (values, floor/ceiling, irange, rank/select) against a sorted list"""
+        rng = random.Random(1)
+        tree = avl.AVL()
+        adict = {}
+        for _ in range(2000):
+            key = rng.randrange(1000)
+            if rng.random() < 0.7:
+                tree[key] = str(key)
+                adict[key] = str(key)
+            elif key in adict:
+                del tree[key]
+                del adict[key]
+            else:
+                self.assertRaises(KeyError, tree.__delitem__, key)
+        tree.check_ri()
+        keys = sorted(adict)
+        self.assertEqual(list(tree), keys)
+        self.assertEqual(dict(tree.items()), adict)
+        self.assertEqual(len(tree), len(keys))
+        for k, key in enumerate(keys):
+            self.assertEqual(tree.select(k).key, key)
+            self.assertEqual(tree.rank(key), k)
+            self.assertEqual(tree[key], str(key))
+        self.assertRaises(IndexError, tree.select, len(keys))
+        for probe in range(-1, 1001):
+            below = [key for key in keys if key <= probe]
+            above = [key for key in keys if key >= probe]
+            floor, ceiling = tree.floor(probe), tree.ceiling(probe)
+            self.assertEqual(floor and floor.key, below[-1] if below else None)
+            self.assertEqual(ceiling and ceiling.key, above[0] if above else None)
+            self.assertEqual(tree.rank(probe), len([key for key in keys if key < probe]))
+        for _ in range(100):
+            lo, hi = sorted(rng.randrange(-10, 1010) for _ in range(2))
+            self.assertEqual([node.key for node in tree.irange(lo, hi)], [key for key in keys if lo <= key <= hi])
+        self.assertEqual([node.key for node in tree.irange(hi=500)], [key for key in keys if key <= 500])
+        self.assertEqual(tree.get(-1, 'missing'), 'missing')
+        self.assertRaises(KeyError, lambda key: tree[key], -1)
+
+    def test_avl_from_sorted(self):
+        """Tests the linear-time bulk load of AVL"""
+        for n in (0, 1, 2, 3, 10, 1000):
+            tree = avl.AVL.from_sorted(range(n), (str(key) for key in range(n)))
+            tree.check_ri()
+            self.assertEqual(list(tree.items()), [(key, str(key)) for key in range(n)])
+            self.assertLessEqual(tree.height(), max(0, n.bit_length() - 1))
+        self.assertRaises(ValueError, avl.AVL.from_sorted, [1, 3, 2])
+        self.assertRaises(ValueError, avl.AVL.from_sorted, [1, 1])
+        self.assertRaises(ValueError, avl.AVL.from_sorted, [1, 2], [1])
+
+    def test_avl_join_split(self):
+        """Tests AVL join and split on trees of very different heights"""
+        rng = random.Random(2)
+        for n, m in ((0, 0), (0, 5), (5, 0), (1, 1), (3, 1000), (1000, 3), (700, 900)):
+            tree = avl.AVL()
+            for key in rng.sample(range(n), n):
+                tree.insert(key)
+            other = avl.AVL.from_sorted(range(n, n + m))
+            tree.join(other)
+            tree.check_ri()
+            other.check_ri()
+            self.assertEqual(list(tree), list(range(n + m)))
+            self.assertEqual(len(other), 0)
+            for key in (-1, 0, (n + m) // 3, n, n + m - 1, n + m + 5):
+                copy = avl.AVL.from_sorted(tree)
+                left, right = copy.split(key)
+                left.check_ri()
+                right.check_ri()
+                self.assertEqual(list(left), [k for k in range(n + m) if k < key])
+                self.assertEqual(list(right), [k for k in range(n + m) if k >= key])
+                self.assertIsNone(copy.root)
+            left, right = tree.split(rng.randrange(n + m + 1))
+            left.join(right)
+            left.check_ri()
+            self.assertEqual(list(left), list(range(n + m)))
+        tree = avl.AVL.from_sorted(range(10))
+        self.assertRaises(ValueError, tree.join, avl.AVL.from_sorted(range(9, 20)))
+
+    def test_sorted_block_list(self):
+        """Tests SortedBlockList (with tiny blocks to exercise splits and merges) against a sorted list"""
+        rng = random.Random(3)
+        index = sorted_blocks.SortedBlockList([5, 1, 3], load=4)
+        keys = [1, 3, 5]
+        for _ in range(3000):
+            key = rng.randrange(200)
+            if rng.random() < 0.55:
+                index.insert(key)
+                keys.append(key)
+                keys.sort()
+            else:
+                self.assertEqual(index.delete(key), key if key in keys else None)
+                if key in keys:
+                    keys.remove(key)
+            self.assertEqual(index.find(key), key if key in keys else None)
+            larger = [k for k in keys if k > key]
+            self.assertEqual(index.next_larger(key), larger[0] if larger else None)
+        self.assertEqual(list(index), keys)
+        self.assertEqual(len(index), len(keys))
+        self.assertEqual(index.find_min(), keys[0])
+        self.assertTrue(all(len(block) <= 8 for block in index._lists))
+        for _ in range(100):
+            lo, hi = sorted(rng.randrange(-10, 210) for _ in range(2))
+            self.assertEqual(list(index.irange(lo, hi)), [k for k in keys if lo <= k <= hi])
+        self.assertEqual(list(index.irange(hi=50)), [k for k in keys if k <= 50])
+        self.assertEqual(list(index.irange(lo=300)), [])
+
+    def test_persistent_avl(self):
+        """Tests that PersistentAVL updates leave older versions intact and share structure"""
+        rng = random.Random(4)
+        versions = [(persistent_avl.PersistentAVL(), {})]
+        for _ in range(1500):
+            tree, adict = versions[-1]
+            key = rng.randrange(300)
+            adict = dict(adict)
+            if rng.random() < 0.65:
+                tree = tree.insert(key, -key)
+                adict[key] = -key
+            else:
+                tree = tree.delete(key)
+                adict.pop(key, None)
+            versions.append((tree, adict))
+        for tree, adict in versions[::50] + versions[-1:]:
+            tree.check_ri()
+            self.assertEqual(dict(tree.items()), adict)
+            self.assertEqual(len(tree), len(adict))
+        old = persistent_avl.PersistentAVL.from_sorted(range(1024))
+        old.check_ri()
+        new = old.insert(2000)
+
+        def nodes(tree):
+            return set(id(node) for node in tree.irange())
+
+        self.assertLessEqual(len(nodes(new) - nodes(old)), 2 * (old.height() + 1))
+        self.assertEqual(list(old), list(range(1024)))
+        self.assertIs(old.delete(5000), old)
+        self.assertEqual(old.get(5000, 'missing'), 'missing')
+        self.assertRaises(KeyError, lambda key: new[key], 5000)
+
+    def test_serialize_round_trip(self):
+        """Tests dump/load of AVL, PersistentAVL and degenerate BSTNode trees in small chunks"""
+        tree = avl.AVL()
+        for key in random.Random(5).sample(range(10 ** 6), 5000):
+            tree[key] = key / 2.0
+        f = io.BytesIO()
+        self.assertEqual(bst_serialize.dump(tree, f, 'q', 'd', chunk_size=999), len(tree))
+        f.seek(0)
+        loaded = bst_serialize.load(f)
+        loaded.check_ri()
+        self.assertEqual(list(loaded.items()), list(tree.items()))
+        self.assertLessEqual(loaded.height(), 12)
+        f.seek(0)
+        chunks = list(bst_serialize.iter_load(f))
+        self.assertEqual([len(keys) for keys, _ in chunks], [999] * 5 + [5])
+        f.seek(0)
+        snapshot = bst_serialize.load(f, persistent_avl.PersistentAVL)
+        self.assertEqual(list(snapshot.items()), list(tree.items()))
+
+        root = bst.BSTNode(0)
+        for key in range(1, 3000):  # deeper than the recursion limit allows for __str__
+            root.insert(bst.BSTNode(key))
+        f = io.BytesIO()
+        bst_serialize.dump(root, f, 'i', chunk_size=1000)
+        self.assertEqual(len(f.getvalue()), bst_serialize.HEADER.size + 4 * 4 + 3000 * 4)
+        f.seek(0)
+        self.assertEqual(list(bst_serialize.load(f)), list(range(3000)))
+
+        root = bst.BSTNode(5)
+        for key in (3, 5, 7, 5):  # BSTNode allows duplicate keys
+            root.insert(bst.BSTNode(key))
+        f = io.BytesIO()
+        self.assertEqual(bst_serialize.dump(root, f, 'i'), 5)
+        f.seek(0)
+        self.assertRaisesRegex(ValueError, 'Duplicate key 5', bst_serialize.load, f)
+        f.seek(0)
+        index = bst_serialize.load(f, sorted_blocks.SortedBlockList)
+        self.assertEqual(list(index), [3, 5, 5, 5, 7])
+        index.insert(5)
+        self.assertEqual(list(index.irange(4, 6)), [5, 5, 5, 5])
+        f = io.BytesIO()
+        self.assertEqual(bst_serialize.dump(index, f, 'i'), 6)  # a reloaded index can be written back
+        f.seek(0)
+        self.assertEqual(list(bst_serialize.load(f, sorted_blocks.SortedBlockList)), [3, 5, 5, 5, 5, 7])
+        self.assertRaises(ValueError, bst_serialize.dump, index, io.BytesIO(), 'i', 'i')
+        self.assertRaises(ValueError, bst_serialize.dump, root, io.BytesIO(), 'i', 'i')
+
+        f = io.BytesIO()
+        bst_serialize.dump(iter([]), f)
+        f.seek(0)
+        self.assertEqual(len(bst_serialize.load(f)), 0)
+        self.assertRaises(ValueError, lambda data: list(bst_serialize.iter_load(io.BytesIO(data))), b'XXXX\x01<q-')
+
+
+if __name__ == '__main__':
+    unittest.main()
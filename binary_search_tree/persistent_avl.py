@@ -0,0 +1,147 @@
+from avl import OrderedMapMixin, build_balanced, check_node, height, size, sorted_items
+from bst import RepInvariantError
+
+
+class PersistentAVLNode(object):
+    """An immutable node of a persistent AVL tree. Nodes are shared between versions of
+    the tree, so they have no parent pointer and must never be modified.
+
+    Attributes:
+        key: Key associated with node.
+        value: Value associated with the key.
+        left: Reference to the left child (keys < key); None if no left child.
+        right: Reference to the right child (keys > key); None if no right child.
+        height: Height of the subtree rooted at this node (a leaf has height 0).
+        size: Number of nodes in the subtree rooted at this node.
+    """
+
+    __slots__ = ('key', 'value', 'left', 'right', 'height', 'size')
+
+    def __init__(self, key, value, left, right):
+        """Inits PersistentAVLNode; height and size are computed from the children."""
+        self.key = key
+        self.value = value
+        self.left = left
+        self.right = right
+        self.height = max(height(left), height(right)) + 1
+        self.size = size(left) + size(right) + 1
+
+
+def _balance(key, value, left, right):
+    """Returns a new node with key, value and children left and right, rotated if the heights
+    of left and right differ by two."""
+    if height(left) > height(right) + 1:
+        if height(left.left) >= height(left.right):
+            return PersistentAVLNode(left.key, left.value, left.left,
+                                     PersistentAVLNode(key, value, left.right, right))
+        middle = left.right
+        return PersistentAVLNode(middle.key, middle.value,
+                                 PersistentAVLNode(left.key, left.value, left.left, middle.left),
+                                 PersistentAVLNode(key, value, middle.right, right))
+    if height(right) > height(left) + 1:
+        if height(right.right) >= height(right.left):
+            return PersistentAVLNode(right.key, right.value,
+                                     PersistentAVLNode(key, value, left, right.left), right.right)
+        middle = right.left
+        return PersistentAVLNode(middle.key, middle.value,
+                                 PersistentAVLNode(key, value, left, middle.left),
+                                 PersistentAVLNode(right.key, right.value, middle.right, right.right))
+    return PersistentAVLNode(key, value, left, right)
+
+
+def _insert(node, key, value):
+    """Returns the root of a copy of the subtree rooted at node with key set to value."""
+    if node is None:
+        return PersistentAVLNode(key, value, None, None)
+    if key < node.key:
+        return _balance(node.key, node.value, _insert(node.left, key, value), node.right)
+    if node.key < key:
+        return _balance(node.key, node.value, node.left, _insert(node.right, key, value))
+    return PersistentAVLNode(key, value, node.left, node.right)
+
+
+def _delete_min(node):
+    """Returns the root of a copy of the subtree rooted at node without its smallest key."""
+    if node.left is None:
+        return node.right
+    return _balance(node.key, node.value, _delete_min(node.left), node.right)
+
+
+def _delete(node, key):
+    """Returns the root of a copy of the subtree rooted at node without key, which has to be there."""
+    if key < node.key:
+        return _balance(node.key, node.value, _delete(node.left, key), node.right)
+    if node.key < key:
+        return _balance(node.key, node.value, node.left, _delete(node.right, key))
+    if node.left is None:
+        return node.right
+    if node.right is None:
+        return node.left
+    successor = node.right
+    while successor.left is not None:
+        successor = successor.left
+    return _balance(successor.key, successor.value, node.left, _delete_min(node.right))
+
+
+class PersistentAVL(OrderedMapMixin):
+    """A persistent (immutable) AVL tree used as an ordered map.
+
+    insert() and delete() leave this version untouched and return a new version that
+    copies only the O(log n) nodes on the search path and shares everything else. Readers
+    can keep using an old version while a writer builds new ones; publishing a version is
+    a single reference assignment. Recursion depth is bounded by the height, O(log n).
+
+    Attributes:
+        root: The root node; None if the tree is empty.
+    """
+
+    __slots__ = ('root',)
+
+    def __init__(self, root=None):
+        """Creates a version of the tree rooted at root (empty by default)."""
+        self.root = root
+
+    @classmethod
+    def from_sorted(cls, keys, values=None):
+        """Builds a perfectly balanced tree from strictly increasing keys in O(n) time.
+
+        Raises:
+            ValueError if keys are not strictly increasing or values do not match keys.
+        """
+        keys, values = sorted_items(keys, values)
+        return cls(build_balanced(keys, values, PersistentAVLNode))
+
+    def find(self, key):
+        """Returns the node with the specified key; None if there is no such node."""
+        current = self.root
+        while current is not None:
+            if key < current.key:
+                current = current.left
+            elif current.key < key:
+                current = current.right
+            else:
+                return current
+        return None
+
+    def insert(self, key, value=None):
+        """Returns a new version with key set to value."""
+        return PersistentAVL(_insert(self.root, key, value))
+
+    def delete(self, key):
+        """Returns a new version without key; this version if key is not in the tree."""
+        if self.find(key) is None:
+            return self
+        return PersistentAVL(_delete(self.root, key))
+
+    def check_ri(self):
+        """Checks the representation invariant (BST order, heights, sizes, balance) in O(n) time."""
+        stack = [(self.root, None, None)] if self.root is not None else []
+        while stack:
+            node, lo, hi = stack.pop()
+            if (lo is not None and not lo < node.key) or (hi is not None and not node.key < hi):
+                raise RepInvariantError('Key out of the bounds set by its ancestors.')
+            check_node(node)
+            if node.left is not None:
+                stack.append((node.left, lo, node.key))
+            if node.right is not None:
+                stack.append((node.right, node.key, hi))
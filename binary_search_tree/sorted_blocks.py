@@ -0,0 +1,170 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+class SortedBlockList(object):
+    """An ordered index of keys stored in a list of sorted blocks (plain Python lists of
+    bounded length) located by bisect, as an alternative to BSTNode trees.
+
+    Keys are kept contiguously, so the index costs one list slot per key instead of a node
+    object with key, parent, left and right attributes. Duplicate keys are allowed, as in
+    BSTNode.
+
+    Attributes:
+        load: Target block length; blocks are split at twice the load and merged with
+            a neighbour below half of the load.
+    """
+
+    def __init__(self, keys=None, load=1000):
+        """Creates an index.
+
+        Args:
+            keys: Iterable of keys to initialise the index with (optional).
+            load: Target block length.
+        """
+        self.load = load
+        self._lists = []  # sorted blocks
+        self._maxes = []  # the largest key of every block
+        self._len = 0
+        if keys is not None:
+            keys = sorted(keys)
+            self._lists = [keys[i:i + load] for i in range(0, len(keys), load)]
+            self._maxes = [block[-1] for block in self._lists]
+            self._len = len(keys)
+
+    @classmethod
+    def from_sorted(cls, keys, values=None, load=1000):
+        """Builds an index from keys in non-decreasing order (duplicates allowed) in O(n) time.
+
+        Args:
+            keys: Iterable of sorted keys.
+            values: Must be None; the index stores keys only.
+            load: Target block length.
+        Raises:
+            ValueError if keys are not sorted or values are given.
+        """
+        if values is not None:
+            raise ValueError('SortedBlockList stores keys only.')
+        keys = list(keys)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError('Keys are not sorted.')
+        index = cls(load=load)
+        index._lists = [keys[i:i + load] for i in range(0, len(keys), load)]
+        index._maxes = [block[-1] for block in index._lists]
+        index._len = len(keys)
+        return index
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        return self._locate(key) is not None
+
+    def __iter__(self):
+        """Iterates over the keys in sorted order."""
+        for block in self._lists:
+            for key in block:
+                yield key
+
+    def _locate(self, key):
+        """Returns (block index, index in block) of the first occurrence of key; None if key is missing."""
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return None
+        block = self._lists[pos]
+        i = bisect_left(block, key)
+        if block[i] != key:
+            return None
+        return pos, i
+
+    def find(self, key):
+        """Returns key if it is in the index, None otherwise."""
+        return None if self._locate(key) is None else key
+
+    def find_min(self):
+        """Returns the smallest key; None if the index is empty."""
+        return self._lists[0][0] if self._lists else None
+
+    def next_larger(self, key):
+        """Returns the smallest key larger than key; None if there is no such key."""
+        pos = bisect_right(self._maxes, key)
+        if pos == len(self._maxes):
+            return None
+        block = self._lists[pos]
+        return block[bisect_right(block, key)]
+
+    def insert(self, key):
+        """Inserts key into the index."""
+        maxes = self._maxes
+        if not maxes:
+            self._lists.append([key])
+            maxes.append(key)
+        else:
+            pos = bisect_right(maxes, key)
+            if pos == len(maxes):
+                pos -= 1
+                self._lists[pos].append(key)
+                maxes[pos] = key
+            else:
+                insort(self._lists[pos], key)
+            if len(self._lists[pos]) > 2 * self.load:
+                self._split(pos)
+        self._len += 1
+
+    def delete(self, key):
+        """Removes one occurrence of key from the index.
+
+        Returns:
+            The removed key; None if key is not in the index.
+        """
+        location = self._locate(key)
+        if location is None:
+            return None
+        pos, i = location
+        block = self._lists[pos]
+        removed = block.pop(i)
+        self._len -= 1
+        if not block:
+            del self._lists[pos]
+            del self._maxes[pos]
+        else:
+            self._maxes[pos] = block[-1]
+            if len(block) < self.load // 2 and len(self._lists) > 1:
+                self._merge(pos)
+        return removed
+
+    def irange(self, lo=None, hi=None):
+        """Yields the keys with lo <= key <= hi in sorted order (None means unbounded)."""
+        lists = self._lists
+        if lo is None:
+            pos, i = 0, 0
+        else:
+            pos = bisect_left(self._maxes, lo)
+            if pos == len(lists):
+                return
+            i = bisect_left(lists[pos], lo)
+        while pos < len(lists):
+            block = lists[pos]
+            j = len(block) if hi is None else bisect_right(block, hi)
+            for key in block[i:j]:  # contiguous slice copy
+                yield key
+            if j < len(block):
+                return
+            pos += 1
+            i = 0
+
+    def _split(self, pos):
+        """Splits the block at pos into two halves."""
+        block = self._lists[pos]
+        half = len(block) // 2
+        self._lists[pos:pos + 1] = [block[:half], block[half:]]
+        self._maxes[pos:pos + 1] = [block[half - 1], block[-1]]
+
+    def _merge(self, pos):
+        """Merges the block at pos with a neighbour (and splits the result again if it is too long)."""
+        if pos == len(self._lists) - 1:
+            pos -= 1
+        self._lists[pos:pos + 2] = [self._lists[pos] + self._lists[pos + 1]]
+        self._maxes[pos:pos + 2] = [self._maxes[pos + 1]]
+        if len(self._lists[pos]) > 2 * self.load:
+            self._split(pos)
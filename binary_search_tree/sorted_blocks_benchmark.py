@@ -0,0 +1,96 @@
+"""
+
+Benchmark of SortedBlockList against BSTNode (and AVL) on random keys
+
+Reports build time, random lookup time, full in-order iteration time and memory per
+key (excluding the key objects themselves). Memory is measured with tracemalloc on a separate build of --memory-n keys,
+since tracing slows allocation down considerably.
+
+Usage: python sorted_blocks_benchmark.py [--n N] [--memory-n M]
+
+Running with --n 10000000 needs several GB of memory for the node-based trees.
+
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+import avl
+import bst
+import sorted_blocks
+
+
+def build_bst(keys):
+    root = bst.BSTNode(keys[0])
+    for key in keys[1:]:
+        root.insert(bst.BSTNode(key))
+    return root
+
+
+def iterate_bst(root):
+    node = root.find_min()
+    while node is not None:
+        node = node.next_larger()
+
+
+def build_avl(keys):
+    tree = avl.AVL()
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def build_blocks(keys):
+    index = sorted_blocks.SortedBlockList()
+    for key in keys:
+        index.insert(key)
+    return index
+
+
+STRUCTURES = (
+    ('BSTNode', build_bst, lambda root, key: root.find(key), iterate_bst),
+    ('AVL', build_avl, lambda tree, key: tree.find(key), lambda tree: sum(1 for _ in tree.irange())),
+    ('SortedBlockList', build_blocks, lambda index, key: index.find(key), lambda index: sum(1 for _ in index)),
+)
+
+
+def memory_per_key(build, keys):
+    tracemalloc.start()
+    structure = build(keys)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return allocated / len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=1000000)
+    parser.add_argument('--memory-n', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=1000000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    keys = rng.sample(range(10 * args.n), args.n)
+    probes = [rng.choice(keys) for _ in range(args.lookups)]
+    memory_keys = keys[:args.memory_n]
+    print('{:<16} {:>10} {:>12} {:>12} {:>12}'.format('structure', 'build s', 'lookup us', 'iterate s', 'bytes/key'))
+    for name, build, find, iterate in STRUCTURES:
+        start = time.perf_counter()
+        structure = build(keys)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for key in probes:
+            find(structure, key)
+        lookup_time = (time.perf_counter() - start) / len(probes)
+        start = time.perf_counter()
+        iterate(structure)
+        iterate_time = time.perf_counter() - start
+        del structure
+        print('{:<16} {:>10.3f} {:>12.3f} {:>12.3f} {:>12.1f}'.format(
+            name, build_time, lookup_time * 1e6, iterate_time, memory_per_key(build, memory_keys)))
+
+
+if __name__ == '__main__':
+    main()
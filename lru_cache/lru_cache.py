@@ -5,11 +5,14 @@ Least Recently Used (LRU) cache
 - LRUCacheDict: implementation based on dictionary; O(n) time-complexity
 
 - LRUCacheHeap: implementation based on dictionary and min-heap; O(log(n)) time-complexity
+  (optionally with lazy deletion of outdated heap entries; amortized O(log(n)) time-complexity)
 
 - LRUCacheQueue: implementation based on dictionary and queue; O(1) time-complexity
 
 """
 
+from operator import attrgetter
+
 
 class LRUCacheDict:
 
@@ -58,13 +61,16 @@ class LRUCacheDict:
 
 
 class VLItem:
+    __slots__ = ('val', 'loc', 'time_stamp')
 
-    def __init__(self, value, location):
+    def __init__(self, value, location=None, time_stamp=None):
         self.val = value
-        self.loc = location
+        self.loc = location  # heap index (eager mode)
+        self.time_stamp = time_stamp  # time stamp of the live heap entry (lazy mode)
 
 
 class HeapElement:
+    __slots__ = ('key', 'time_stamp')
 
     def __init__(self, key, time_stamp):
         self.key = key
@@ -75,68 +81,116 @@ class HeapElement:
 
 
 class LRUCacheHeap:
+    """LRU cache backed by an indexed binary min-heap of time stamps.
 
-    def __init__(self, capacity):
+    In the default (eager) mode every key has exactly one heap entry whose index is
+    kept in vl_dict; touching a key gives it the newest time stamp and sifts it down.
+
+    In lazy mode touching a key only appends a new entry (the newest time stamp is
+    always the heap maximum, so no sifting is needed); outdated entries are discarded
+    when they reach the root during eviction, and the heap is compacted once it grows
+    past twice the capacity.
+    """
+
+    def __init__(self, capacity, lazy=False):
         self.capacity = capacity
+        self.lazy = lazy
         self.time_step = 0
-        self.storage = []  # min heap
+        self.storage = []  # min heap (zero-based indexing)
         self.vl_dict = {}  # values are VLItem objects
 
-    def parent(self, i):
-        if i == 1:
-            return None
-        return i // 2
-
-    def heapify(self, i):  # min heapify at location i
-        size = len(self.storage)
-        l = 2 * i
-        r = 2 * i + 1
-        smallest = i
-        if l <= size and self.storage[l - 1] < self.storage[smallest - 1]:
-            smallest = l
-        if r <= size and self.storage[r - 1] < self.storage[smallest - 1]:
-            smallest = r
-        if smallest != i:
-            self.storage[i - 1], self.storage[smallest - 1] = self.storage[smallest - 1], self.storage[i - 1]
-            self.vl_dict[self.storage[i - 1].key].loc = i - 1
-            self.vl_dict[self.storage[smallest - 1].key].loc = smallest - 1
-            self.heapify(smallest)
+    def _sift_down(self, pos):
+        """Moves the element at pos (zero-based) down until the min-heap property holds."""
+        storage = self.storage
+        vl_dict = None if self.lazy else self.vl_dict
+        size = len(storage)
+        element = storage[pos]
+        time_stamp = element.time_stamp
+        child = 2 * pos + 1
+        while child < size:
+            right = child + 1
+            if right < size and storage[right].time_stamp < storage[child].time_stamp:
+                child = right
+            child_element = storage[child]
+            if time_stamp < child_element.time_stamp:
+                break
+            storage[pos] = child_element
+            if vl_dict is not None:
+                vl_dict[child_element.key].loc = pos
+            pos = child
+            child = 2 * pos + 1
+        storage[pos] = element
+        if vl_dict is not None:
+            vl_dict[element.key].loc = pos
+
+    def _pop_stale(self):
+        """Removes heap entries whose time stamp is outdated from the top of the heap (lazy mode)."""
+        storage = self.storage
+        vl_dict = self.vl_dict
+        while storage[0].time_stamp != vl_dict[storage[0].key].time_stamp:
+            last = storage.pop()
+            if not storage:
+                return
+            storage[0] = last
+            self._sift_down(0)
+
+    def _compact(self):
+        """Drops all outdated heap entries (lazy mode); a sorted list is a valid min-heap."""
+        vl_dict = self.vl_dict
+        self.storage = sorted((e for e in self.storage if e.time_stamp == vl_dict[e.key].time_stamp),
+                              key=attrgetter('time_stamp'))
 
     def find_min_key(self):
+        if self.lazy:
+            self._pop_stale()
         return self.storage[0].key
 
     def replace_min(self, key, val):
         del self.vl_dict[self.find_min_key()]
-        self.storage[0] = HeapElement(key, self.time_step)
-        self.vl_dict[key] = VLItem(val, 0)
-        self.heapify(1)
+        element = self.storage[0]  # the root may have changed while dropping stale entries
+        element.key = key  # reuse the evicted element instead of allocating a new one
+        element.time_stamp = self.time_step
+        self.vl_dict[key] = VLItem(val, None, self.time_step) if self.lazy else VLItem(val, 0)
+        self._sift_down(0)
+
+    def _touch(self, item, key):
+        """Gives the key the newest time stamp."""
+        if self.lazy:
+            item.time_stamp = self.time_step
+            self.storage.append(HeapElement(key, self.time_step))  # newest time stamp is the maximum
+            if len(self.storage) > 2 * self.capacity:
+                self._compact()
+        else:
+            loc = item.loc
+            self.storage[loc].time_stamp = self.time_step  # update priority of the current element
+            self._sift_down(loc)
 
     def get(self, key):
         if key not in self.vl_dict:
             raise KeyError
-        value = self.vl_dict[key].val
-        loc = self.vl_dict[key].loc
-        self.storage[loc].time_stamp = self.time_step  # update priority of the current element
-        self.heapify(loc + 1)
+        item = self.vl_dict[key]
+        self._touch(item, key)
         self.time_step += 1
-        return value
+        return item.val
 
     def __getitem__(self, key):
         return self.get(key)
 
     def set(self, key, val):
         if key in self.vl_dict:
-            self.vl_dict[key].val = val
-            loc = self.vl_dict[key].loc
-            self.storage[loc].time_stamp = self.time_step  # update priority of the current element
-            self.heapify(loc + 1)
+            item = self.vl_dict[key]
+            item.val = val
+            self._touch(item, key)
         else:
-            if len(self.storage) == self.capacity:
+            if len(self.vl_dict) == self.capacity:
                 self.replace_min(key, val)
             else:
                 # newly inserted key has the largest heap key (min-heap property is preserved)
                 self.storage.append(HeapElement(key, self.time_step))
-                self.vl_dict[key] = VLItem(val, len(self.storage) - 1)
+                if self.lazy:
+                    self.vl_dict[key] = VLItem(val, None, self.time_step)
+                else:
+                    self.vl_dict[key] = VLItem(val, len(self.storage) - 1)
         self.time_step += 1
 
     def __setitem__(self, key, val):
@@ -222,43 +276,139 @@ class DoublyLinkedList:
         node.next = None
         node.prev = None
 
+    def move_to_end(self, node):
+        if node is self.tail:
+            return
+        if node is self.head:
+            self.head = node.next
+            self.head.prev = None
+        else:
+            node.prev.next = node.next
+            node.next.prev = node.prev
+        self.tail.next = node
+        node.prev = self.tail
+        node.next = None
+        self.tail = node
+
 
 class LRUCacheQueue:
+    """LRU cache backed by a dictionary and a doubly linked list ordered by recency.
+
+    Pinned entries are kept outside of the list, so they are never evicted and they do
+    not count towards the capacity.
+    """
 
     def __init__(self, capacity):
         self.capacity = capacity
         self.dll = DoublyLinkedList()
-        self.adict = {}
+        self.adict = {}  # unpinned entries
+        self.pinned = {}
 
     def get(self, key):
         if key not in self.adict:
+            if key in self.pinned:
+                return self.pinned[key].value[1]
             raise KeyError
         node = self.adict[key]
-        value = node.value[1]
-        self.dll.delete(node)
-        self.dll.append(node)
-        return value
+        self.dll.move_to_end(node)
+        return node.value[1]
 
     def __getitem__(self, key):
         return self.get(key)
 
+    def get_many(self, keys):
+        """Looks up keys in one call without raising on misses.
+
+        Returns:
+            A pair (hits, misses): a dict of the cached values and a list of the keys not in cache.
+        """
+        adict = self.adict
+        pinned = self.pinned
+        move_to_end = self.dll.move_to_end
+        hits = {}
+        misses = []
+        for key in keys:
+            node = adict.get(key)
+            if node is not None:
+                move_to_end(node)
+                hits[key] = node.value[1]
+            elif key in pinned:
+                hits[key] = pinned[key].value[1]
+            else:
+                misses.append(key)
+        return hits, misses
+
     def set(self, key, val):
         if key in self.adict:
             node = self.adict[key]
             node.value[1] = val
-            self.dll.delete(node)
-            self.dll.append(node)
+            self.dll.move_to_end(node)
+            return
+        if key in self.pinned:
+            self.pinned[key].value[1] = val
             return
         node = Node([key, val])
         self.adict[key] = node
-        if self.dll.size == self.capacity:
+        while self.dll.size >= self.capacity:
             node_to_delete = self.dll.popleft()
             del self.adict[node_to_delete.value[0]]
         self.dll.append(node)
 
+    def set_many(self, items):
+        """Stores (key, value) pairs (or a mapping) with all evictions done in one batch.
+
+        The result is the same as calling set() for every item in order; if an item is
+        invalid (e.g. an unhashable key), the items before it stay stored and the cache is
+        trimmed back to its capacity before the error propagates.
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        adict = self.adict
+        pinned = self.pinned
+        dll = self.dll
+        try:
+            for key, val in items:
+                node = adict.get(key)
+                if node is not None:
+                    node.value[1] = val
+                    dll.move_to_end(node)
+                elif key in pinned:
+                    pinned[key].value[1] = val
+                else:
+                    node = Node([key, val])
+                    adict[key] = node
+                    dll.append(node)
+        finally:
+            for _ in range(dll.size - self.capacity):
+                del adict[dll.popleft().value[0]]
+
+    def pin(self, key):
+        """Protects a cached entry from eviction.
+
+        Raises:
+            KeyError if key is not in cache.
+        """
+        if key in self.pinned:
+            return
+        node = self.adict.pop(key)
+        self.dll.delete(node)
+        self.pinned[key] = node
+
+    def unpin(self, key):
+        """Makes a pinned entry evictable again, as the most recently used one.
+
+        Raises:
+            KeyError if key is not pinned.
+        """
+        node = self.pinned.pop(key)
+        while self.dll.size >= self.capacity:
+            del self.adict[self.dll.popleft().value[0]]
+        self.adict[key] = node
+        self.dll.append(node)
+
     def __setitem__(self, key, val):
         self.set(key, val)
 
     def __contains__(self, key):
         """Checks whether key is in cache without changing its priority."""
-        return key in self.adict
+        return key in self.adict or key in self.pinned
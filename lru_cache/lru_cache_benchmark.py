@@ -0,0 +1,251 @@
+"""
+
+Trace-replay benchmark of the LRU cache implementations
+
+Every key of a trace is replayed read-through: a hit reads the cached value, a miss
+stores the key. For each cache and workload the benchmark reports throughput
+(operations per second), hit ratio, peak memory allocated by the cache (tracemalloc)
+and per-operation latency percentiles. Throughput, latency and memory are measured in
+separate passes so that the instrumentation of one does not distort the others.
+
+Workloads:
+
+- zipf: keys drawn from a Zipfian distribution (--alpha) over --keys distinct keys
+
+- scan: zipf traffic interleaved with --scans sequential scans over keys never seen
+  before, evenly spread over the trace (each as long as the capacity by default)
+
+- loop: keys cycling over a working set slightly larger than the capacity (skipped
+  when --ops is too short to go around the loop twice)
+
+- trace: a recorded trace, one key per line (--trace FILE)
+
+Usage: python lru_cache_benchmark.py [--workloads zipf scan loop] [--capacities 1000 1000000] [--ops N]
+                                     [--caches queue heap heap-lazy dict functools] [--json]
+                                     [--scans N] [--scan-length N]
+
+LRUCacheDict is O(capacity) per operation; leave it out at large capacities.
+
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import lru_cache
+
+
+CACHES = {
+    'dict': lru_cache.LRUCacheDict,
+    'heap': lru_cache.LRUCacheHeap,
+    'heap-lazy': functools.partial(lru_cache.LRUCacheHeap, lazy=True),
+    'queue': lru_cache.LRUCacheQueue,
+    'functools': None,  # functools.lru_cache, see replay_functools()
+}
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def zipf_trace(ops, keys, alpha, rng):
+    """Returns ops keys drawn from a Zipfian distribution over range(keys)."""
+    cum_weights = list(itertools.accumulate(1.0 / (rank ** alpha) for rank in range(1, keys + 1)))
+    return rng.choices(range(keys), cum_weights=cum_weights, k=ops)
+
+
+def scan_trace(ops, keys, alpha, rng, scan_length, scans):
+    """Returns ops keys of zipf traffic split into scans equal periods, each of which ends
+    with a scan of scan_length fresh keys."""
+    period = ops // scans
+    if not 0 < scan_length < period:
+        raise ValueError('Scans of {} keys do not fit in periods of {} keys'.format(scan_length, period))
+    trace = zipf_trace(ops - scans * scan_length, keys, alpha, rng)
+    result = []
+    fresh = keys
+    for start in range(0, len(trace), period - scan_length):
+        result.extend(trace[start:start + period - scan_length])
+        result.extend(range(fresh, fresh + scan_length))
+        fresh += scan_length
+    return result[:ops]
+
+
+def loop_trace(ops, loop_size):
+    """Returns keys cycling over range(loop_size)."""
+    return list(itertools.islice(itertools.cycle(range(loop_size)), ops))
+
+
+def file_trace(path, ops=None):
+    """Returns keys read from a file, one key per line."""
+    with open(path) as f:
+        keys = [line.rstrip('\n') for line in f]
+    return keys if ops is None else keys[:ops]
+
+
+def replay(cache, trace):
+    """Replays trace against cache; returns the number of hits."""
+    hits = 0
+    for key in trace:
+        if key in cache:
+            cache[key]
+            hits += 1
+        else:
+            cache[key] = key
+    return hits
+
+
+def replay_timed(cache, trace):
+    """Replays trace against cache; returns the list of per-operation latencies in nanoseconds."""
+    clock = time.perf_counter_ns
+    latencies = []
+    append = latencies.append
+    for key in trace:
+        start = clock()
+        if key in cache:
+            cache[key]
+        else:
+            cache[key] = key
+        append(clock() - start)
+    return latencies
+
+
+class FunctoolsCache:
+    """Adapter giving functools.lru_cache the replay interface; hits come from cache_info()."""
+
+    def __init__(self, capacity):
+        self.lookup = functools.lru_cache(maxsize=capacity)(lambda key: key)
+
+    def __contains__(self, key):
+        return False  # every access goes through __setitem__, the cache decides hit or miss
+
+    def __setitem__(self, key, val):
+        self.lookup(key)
+
+
+def make_cache(name, capacity):
+    if name == 'functools':
+        return FunctoolsCache(capacity)
+    return CACHES[name](capacity)
+
+
+def percentile(sorted_values, p):
+    """Returns the p-th percentile (nearest rank) of a sorted list."""
+    if not sorted_values:
+        return 0
+    rank = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def measure(name, capacity, trace, latency=True, memory=True):
+    """Runs the throughput, latency and memory passes; returns a result dict."""
+    cache = make_cache(name, capacity)
+    start = time.perf_counter()
+    hits = replay(cache, trace)
+    elapsed = time.perf_counter() - start
+    if name == 'functools':
+        hits = cache.lookup.cache_info().hits
+    result = {
+        'cache': name,
+        'capacity': capacity,
+        'ops': len(trace),
+        'seconds': elapsed,
+        'ops_per_sec': len(trace) / elapsed if elapsed else float('inf'),
+        'hit_ratio': hits / len(trace) if trace else 0.0,
+    }
+    if latency:
+        latencies = sorted(replay_timed(make_cache(name, capacity), trace))
+        for p in PERCENTILES:
+            result['latency_p{}_ns'.format(p)] = percentile(latencies, p)
+        del latencies
+    if memory:
+        tracemalloc.start()
+        cache = make_cache(name, capacity)
+        replay(cache, trace)
+        result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def warn(message):
+    print('warning: ' + message, file=sys.stderr)
+
+
+def make_traces(args, capacity, rng):
+    """Yields (workload name, trace) pairs for the requested workloads, skipping (with a
+    warning) the ones that the trace length cannot represent at this capacity."""
+    keys = args.keys or 10 * capacity
+    if args.ops <= capacity:
+        warn('{} ops do not fill a cache of capacity {}; every key is a compulsory miss'.format(args.ops, capacity))
+    for workload in args.workloads:
+        if workload == 'zipf':
+            yield workload, zipf_trace(args.ops, keys, args.alpha, rng)
+        elif workload == 'scan':
+            # by default a scan is as long as the capacity (it flushes an LRU cache), but
+            # at most half of a period so that zipf traffic can warm the cache up again
+            period = args.ops // args.scans
+            scan_length = args.scan_length or min(capacity, period // 2)
+            if scan_length >= period or scan_length == 0:
+                warn('skipping scan at capacity {}: {} scans of {} keys do not fit in {} ops'.format(
+                    capacity, args.scans, scan_length, args.ops))
+                continue
+            if scan_length < capacity:
+                warn('scans at capacity {} are shortened to {} keys; raise --ops for full-length scans'.format(
+                    capacity, scan_length))
+            yield workload, scan_trace(args.ops, keys, args.alpha, rng, scan_length, args.scans)
+        elif workload == 'loop':
+            loop_size = capacity + capacity // 10 + 1
+            if args.ops < 2 * loop_size:
+                warn('skipping loop at capacity {}: {} ops do not repeat a loop of {} keys'.format(
+                    capacity, args.ops, loop_size))
+                continue
+            yield workload, loop_trace(args.ops, loop_size)
+    for path in args.trace:
+        yield path, file_trace(path, args.ops)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ops', type=int, default=1000000, help='operations per trace')
+    parser.add_argument('--capacities', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--caches', nargs='+', choices=sorted(CACHES), default=['queue', 'heap', 'heap-lazy', 'functools'])
+    parser.add_argument('--workloads', nargs='*', choices=['zipf', 'scan', 'loop'], default=['zipf', 'scan', 'loop'])
+    parser.add_argument('--trace', nargs='*', default=[], help='recorded trace files, one key per line')
+    parser.add_argument('--keys', type=int, default=None, help='distinct keys of zipf/scan (default: 10 * capacity)')
+    parser.add_argument('--alpha', type=float, default=1.0, help='Zipfian exponent')
+    parser.add_argument('--scans', type=int, default=4, help='scans per scan trace')
+    parser.add_argument('--scan-length', type=int, default=None,
+                        help='keys per scan (default: capacity, at most half of ops / scans)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-latency', dest='latency', action='store_false')
+    parser.add_argument('--no-memory', dest='memory', action='store_false')
+    parser.add_argument('--json', action='store_true', help='print one JSON object per result')
+    args = parser.parse_args()
+
+    environment = {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                   'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    if not args.json:
+        print('{:<12} {:<10} {:>9} {:>13} {:>7} {:>9} {:>9} {:>12}'.format(
+            'cache', 'workload', 'capacity', 'ops/s', 'hits', 'p50 ns', 'p99 ns', 'peak KiB'))
+    for capacity in args.capacities:
+        rng = random.Random(args.seed)
+        for workload, trace in make_traces(args, capacity, rng):
+            for name in args.caches:
+                result = measure(name, capacity, trace, args.latency, args.memory)
+                result['workload'] = workload
+                if args.json:
+                    result.update(environment)
+                    print(json.dumps(result))
+                else:
+                    print('{:<12} {:<10} {:>9} {:>13,.0f} {:>7.2%} {:>9} {:>9} {:>12,.0f}'.format(
+                        name, workload, capacity, result['ops_per_sec'], result['hit_ratio'],
+                        result.get('latency_p50_ns', '-'), result.get('latency_p99_ns', '-'),
+                        result.get('peak_memory_bytes', 0) / 1024))
+                sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 import lru_cache
 import memo
@@ -10,8 +11,9 @@ class SimpleCasesFibonacci(unittest.TestCase):
         capacity = 1
         lru_list = lru_cache.LRUCacheDict(capacity)
         lru_heap = lru_cache.LRUCacheHeap(capacity)
+        lru_lazy = lru_cache.LRUCacheHeap(capacity, lazy=True)
         lru_queue = lru_cache.LRUCacheQueue(capacity)
-        tuple_of_lrus = (lru_list, lru_heap, lru_queue)
+        tuple_of_lrus = (lru_list, lru_heap, lru_lazy, lru_queue)
         for lru in tuple_of_lrus:
             self.assertRaises(KeyError, lambda x: lru[x], 0)
             lru[1] = 100
@@ -27,8 +29,9 @@ class SimpleCasesFibonacci(unittest.TestCase):
         capacity = 2
         lru_list = lru_cache.LRUCacheDict(capacity)
         lru_heap = lru_cache.LRUCacheHeap(capacity)
+        lru_lazy = lru_cache.LRUCacheHeap(capacity, lazy=True)
         lru_queue = lru_cache.LRUCacheQueue(capacity)
-        tuple_of_lrus = (lru_list, lru_heap, lru_queue)
+        tuple_of_lrus = (lru_list, lru_heap, lru_lazy, lru_queue)
         for lru in tuple_of_lrus:
             lru[1] = 100
             lru[2] = 200
@@ -52,8 +55,9 @@ class SimpleCasesFibonacci(unittest.TestCase):
         capacity = 3
         lru_list = lru_cache.LRUCacheDict(capacity)
         lru_heap = lru_cache.LRUCacheHeap(capacity)
+        lru_lazy = lru_cache.LRUCacheHeap(capacity, lazy=True)
         lru_queue = lru_cache.LRUCacheQueue(capacity)
-        tuple_of_lrus = (lru_list, lru_heap, lru_queue)
+        tuple_of_lrus = (lru_list, lru_heap, lru_lazy, lru_queue)
         for lru in tuple_of_lrus:
             lru[1] = 100
             lru[2] = 200
@@ -82,6 +86,89 @@ class SimpleCasesFibonacci(unittest.TestCase):
             self.assertEqual(lru[2], 2000)
             self.assertEqual(lru[7], 700)
 
+    def test_heap_matches_queue(self):
+        """Tests eager and lazy LRUCacheHeap against LRUCacheQueue on random operations"""
+        rng = random.Random(0)
+        for capacity in (1, 2, 5, 17):
+            lru_queue = lru_cache.LRUCacheQueue(capacity)
+            lru_heap = lru_cache.LRUCacheHeap(capacity)
+            lru_lazy = lru_cache.LRUCacheHeap(capacity, lazy=True)
+            for _ in range(2000):
+                key = rng.randrange(3 * capacity)
+                if rng.random() < 0.5:
+                    for lru in (lru_queue, lru_heap, lru_lazy):
+                        lru[key] = key * 10
+                elif key in lru_queue:
+                    self.assertEqual(lru_heap[key], lru_queue[key])
+                    self.assertEqual(lru_lazy[key], key * 10)
+                else:
+                    self.assertFalse(key in lru_heap)
+                    self.assertFalse(key in lru_lazy)
+            self.assertLessEqual(len(lru_lazy.storage), 2 * capacity)
+
+    def test_queue_get_many_set_many(self):
+        """Tests batched lookups and stores of LRUCacheQueue against single-key calls"""
+        rng = random.Random(1)
+        for capacity in (1, 3, 10):
+            lru_batch = lru_cache.LRUCacheQueue(capacity)
+            for _ in range(300):
+                lru_single = lru_cache.LRUCacheQueue(capacity)
+                node = lru_batch.dll.head
+                while node is not None:  # same entries in the same recency order
+                    lru_single[node.value[0]] = node.value[1]
+                    node = node.next
+                keys = [rng.randrange(3 * capacity) for _ in range(rng.randrange(1, 2 * capacity))]
+                if rng.random() < 0.5:
+                    hits, misses = lru_batch.get_many(keys)
+                    for key in keys:
+                        if key in lru_single:
+                            self.assertEqual(hits[key], lru_single[key])
+                        else:
+                            self.assertIn(key, misses)
+                else:
+                    items = [(key, rng.random()) for key in keys]
+                    lru_batch.set_many(items)
+                    for key, val in items:
+                        lru_single[key] = val
+                    self.assertEqual(set(lru_batch.adict), set(lru_single.adict))
+                    for key in lru_batch.adict:
+                        self.assertEqual(lru_batch.adict[key].value[1], lru_single.adict[key].value[1])
+                self.assertLessEqual(lru_batch.dll.size, capacity)
+                self.assertEqual(lru_batch.dll.size, len(lru_batch.adict))
+        lru = lru_cache.LRUCacheQueue(2)
+        lru.set_many({1: 100, 2: 200})
+        self.assertEqual(lru.get_many([2, 3, 1]), ({2: 200, 1: 100}, [3]))
+        lru.set_many([(3, 300), (4, 400), (1, 10)])  # more distinct keys than the capacity
+        self.assertEqual(lru.get_many([1, 2, 3, 4]), ({1: 10, 4: 400}, [2, 3]))
+        lru = lru_cache.LRUCacheQueue(2)  # a batch failing partway through is still bounded
+        self.assertRaises(TypeError, lru.set_many, [(1, 1), (2, 2), (3, 3), ([], 4)])
+        self.assertEqual(lru.get_many([1, 2, 3]), ({2: 2, 3: 3}, [1]))
+        for key in range(10):
+            lru[key] = key
+        self.assertEqual(lru.dll.size, 2)
+        self.assertEqual(len(lru.adict), 2)
+
+    def test_queue_pin(self):
+        """Tests that pinned entries of LRUCacheQueue are never evicted"""
+        lru = lru_cache.LRUCacheQueue(2)
+        lru[1] = 100
+        lru.pin(1)
+        self.assertRaises(KeyError, lru.pin, 2)
+        lru[2] = 200
+        lru[3] = 300
+        lru[4] = 400
+        lru.set_many([(5, 500), (6, 600), (7, 700)])
+        self.assertTrue(1 in lru)
+        self.assertEqual(lru[1], 100)
+        lru[1] = 10
+        self.assertEqual(lru.get_many([1, 6, 7]), ({1: 10, 6: 600, 7: 700}, []))
+        lru.unpin(1)
+        self.assertFalse(6 in lru)
+        lru[8] = 800
+        lru[9] = 900
+        self.assertFalse(1 in lru)
+        self.assertRaises(KeyError, lru.unpin, 1)
+
     def test_fibonacci(self):
         """Tests LRUCacheQueue for recursive function calls (Fibonacci)"""
         f1 = lambda n: 1 if n < 2 else f1(n - 1) + f1(n - 2)
@@ -1,19 +1,40 @@
+import operator
+from abc import ABC, abstractmethod
+
 
 class RepInvariantError(AssertionError):
     pass
 
 class MaxHeap(object):
-    """An implementation of a max heap.""" 
+    """An implementation of a max heap (or a min heap, see min_heap).""" 
     
-    def __init__(self, alist):
+    def __init__(self, alist, key=None, min_heap=False):
         """Creates a max heap. 
         
         Args: 
-            alist: Alist from which the max heap is build. 
+            alist: Alist from which the max heap is build (in place). 
+            key: Function computing the comparison key of an element (optional).
+            min_heap: If True, the element with the smallest key is on top instead.
         """
         self.alist = alist
         self.size = len(alist)
+        self.key = key
+        self.min_heap = min_heap
+        higher = operator.lt if min_heap else operator.gt  # higher(a, b): a belongs above b
+        if key is not None:
+            compare = higher
+            higher = lambda a, b: compare(key(a), key(b))
+        self.higher = higher
         self.build_max_heap() 
+
+    def __len__(self):
+        return self.size
+
+    def peek(self):
+        """Returns the max element of the max heap without removing it."""
+        if self.size == 0:
+            raise IndexError('peek from empty heap')
+        return self.alist[0]
         
     def parent(self, i):
         """Returns index of node's parent (one-based indexing).
@@ -47,78 +68,398 @@ class MaxHeap(object):
             Index of the node's right child. 
         """
         return 2 * i + 1 
+
+    def _sift_down(self, pos):
+        """Moves the element at pos (zero-based) down until neither child belongs above it."""
+        alist = self.alist
+        higher = self.higher
+        size = self.size
+        item = alist[pos]
+        child = 2 * pos + 1
+        while child < size:
+            right = child + 1
+            if right < size and higher(alist[right], alist[child]):
+                child = right
+            if not higher(alist[child], item):
+                break
+            alist[pos] = alist[child]
+            pos = child
+            child = 2 * pos + 1
+        alist[pos] = item
+
+    def _sift_up(self, pos):
+        """Moves the element at pos (zero-based) up while it belongs above its parent."""
+        alist = self.alist
+        higher = self.higher
+        item = alist[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not higher(item, alist[parent]):
+                break
+            alist[pos] = alist[parent]
+            pos = parent
+        alist[pos] = item
     
     def max_heapify(self, i): 
-        """Corrects a single violation of the heap property in a subtree rooted at a node of index i.""" 
-        l = self.left(i)
-        r = self.right(i)
-        largest = i
-        if l <= self.size and self.alist[l-1] > self.alist[largest-1]: #condition for max heap
-        #if l <= self.size and self.alist[l-1] < self.alist[largest-1]: #condition for min heap
-            largest = l
-        if r <= self.size and self.alist[r-1] > self.alist[largest-1]: #condition for max heap
-        #if r <= self.size and self.alist[r-1] < self.alist[largest-1]: #condition for min heap
-            largest = r
-        if largest != i:
-            self.alist[i-1], self.alist[largest-1] = self.alist[largest-1], self.alist[i-1] 
-            self.max_heapify(largest)
+        """Corrects a single violation of the heap property in a subtree rooted at a node of index i
+        (one-based indexing).""" 
+        self._sift_down(i - 1)
         return self
         
     def build_max_heap(self):
         """Produces a max heap from an unordered list."""
-        for i in range(self.size // 2, 0, -1):
-            self.max_heapify(i)
-        #self.ri_check()
+        for pos in range(self.size // 2 - 1, -1, -1):
+            self._sift_down(pos)
         return self 
     
     def extract_max(self):
         """Extract and returns the max element of the max heap."""
-        self.alist[0], self.alist[-1] = self.alist[-1], self.alist[0]
-        heap_max = self.alist.pop()
-        self.size = len(self.alist)
-        self.max_heapify(1)
-        #self.ri_check()
+        alist = self.alist
+        last = alist.pop()
+        self.size = len(alist)
+        if not alist:
+            return last
+        heap_max = alist[0]
+        alist[0] = last
+        self._sift_down(0)
         return heap_max
     
     def insert(self, value):
         """Inserts value into the max heap."""
         self.alist.append(value)
         self.size = len(self.alist)
-        up = self.parent(self.size)
-        while up is not None: 
-            self.max_heapify(up) 
-            up = self.parent(up)
-        #self.ri_check()
+        self._sift_up(self.size - 1)
         return self
+
+    def replace_max(self, value):
+        """Replaces the max element of the max heap with value; returns the replaced element."""
+        if self.size == 0:
+            raise IndexError('replace on empty heap')
+        heap_max = self.alist[0]
+        self.alist[0] = value
+        self._sift_down(0)
+        return heap_max
             
     def ri_check(self): 
         """Checks if representation invariant is preserved."""
-        for i in range(self.size // 2, 0, -1): 
-            l = self.left(i)
-            r = self.right(i)
-            largest = i 
-            if l <= self.size and self.alist[l-1] > self.alist[largest-1]: #condition for max heap
-            #if l <= self.size and self.alist[l-1] < self.alist[largest-1]: #condition for min heap
-                largest = l
-            if r <= self.size and self.alist[r-1] > self.alist[largest-1]: #condition for max heap
-            #if r <= self.size and self.alist[r-1] < self.alist[largest-1]: #condition for min heap
-                largest = r
-            if largest != i:
+        alist = self.alist
+        higher = self.higher
+        for pos in range(1, self.size):
+            if higher(alist[pos], alist[(pos - 1) >> 1]):
                 raise RepInvariantError('Representation invariant is not preserved.')
     
-def heap_sort(list_to_sort):
-    """Sorts a list using max heap. 
+class HeapHandle(object):
+    """A handle to an entry of AddressableMaxHeap.
+
+    Attributes:
+        item: Item stored in the entry.
+        priority: Priority of the item.
+        index: Position of the entry in the heap array (zero-based); -1 once removed.
+    """
+
+    __slots__ = ('item', 'priority', 'index')
+
+    def __init__(self, item, priority, index):
+        """Creates a handle."""
+        self.item = item
+        self.priority = priority
+        self.index = index
+
+
+class PriorityQueue(ABC):
+    """Interface of the addressable priority queue engines (AddressableMaxHeap and the
+    engines in priority_queue.py).
+
+    Entries are (item, priority) pairs; insert() returns a handle with item and priority
+    attributes which identifies the entry in update() and remove(). The entry on top has
+    the maximum priority, or the minimum one if the queue was created with min_heap=True.
+    An engine has to implement every abstract method before it can be instantiated.
+    """
+
+    def __init__(self, min_heap=False):
+        """Creates an empty priority queue.
+
+        Args:
+            min_heap: If True, the entry with the smallest priority is on top instead.
+        """
+        self.min_heap = min_heap
+        self.higher = operator.lt if min_heap else operator.gt  # higher(a, b): priority a belongs above b
+
+    @abstractmethod
+    def __len__(self):
+        """Returns the number of entries."""
+
+    @abstractmethod
+    def __contains__(self, handle):
+        """Tests whether the entry of handle is in the queue."""
+
+    @abstractmethod
+    def insert(self, item, priority):
+        """Inserts item with priority; returns the handle of the new entry."""
+
+    @abstractmethod
+    def peek(self):
+        """Returns the handle of the entry on top; raises IndexError if the queue is empty."""
+
+    @abstractmethod
+    def extract(self):
+        """Removes and returns the handle of the entry on top; raises IndexError if the queue is empty."""
+
+    @abstractmethod
+    def update(self, handle, priority):
+        """Changes the priority of the entry of handle; raises ValueError if it is not in the queue."""
+
+    @abstractmethod
+    def remove(self, handle):
+        """Removes the entry of handle; raises ValueError if it is not in the queue."""
+
+
+class AddressableMaxHeap(PriorityQueue):
+    """A binary max heap (or min heap) of (item, priority) entries addressed by handles.
+
+    insert() returns a handle through which the priority of the entry can be changed or the
+    entry can be removed in O(log n) time; every handle knows its position in the heap
+    array, which is kept up to date on every move.
+    """
+
+    def __init__(self, min_heap=False):
+        """Creates an empty heap."""
+        PriorityQueue.__init__(self, min_heap)
+        self.handles = []
+
+    def __len__(self):
+        return len(self.handles)
+
+    def __contains__(self, handle):
+        index = handle.index
+        return 0 <= index < len(self.handles) and self.handles[index] is handle
+
+    def insert(self, item, priority):
+        """Inserts item with priority into the heap.
+
+        Returns:
+            Handle of the new entry.
+        """
+        handle = HeapHandle(item, priority, len(self.handles))
+        self.handles.append(handle)
+        self._sift_up(handle.index)
+        return handle
+
+    def peek(self):
+        """Returns the handle of an entry with the maximum priority.
+
+        Raises:
+            IndexError if the heap is empty.
+        """
+        if not self.handles:
+            raise IndexError('peek from empty heap')
+        return self.handles[0]
+
+    def extract(self):
+        """Removes and returns the handle of the entry on top: one with the maximum priority,
+        or the minimum one if the heap was created with min_heap=True.
+
+        Raises:
+            IndexError if the heap is empty.
+        """
+        if not self.handles:
+            raise IndexError('extract from empty heap')
+        handle = self.handles[0]
+        self.remove(handle)
+        return handle
+
+    extract_max = extract
+
+    def update(self, handle, priority):
+        """Changes the priority of the entry of handle (increase-key or decrease-key).
+
+        Raises:
+            ValueError if the entry is not in the heap.
+        """
+        if handle not in self:
+            raise ValueError('Handle is not in the heap.')
+        old_priority = handle.priority
+        handle.priority = priority
+        if self.higher(priority, old_priority):
+            self._sift_up(handle.index)
+        else:
+            self._sift_down(handle.index)
+
+    def remove(self, handle):
+        """Removes the entry of handle from the heap.
+
+        Raises:
+            ValueError if the entry is not in the heap.
+        """
+        if handle not in self:
+            raise ValueError('Handle is not in the heap.')
+        handles = self.handles
+        index = handle.index
+        last = handles.pop()
+        handle.index = -1
+        if last is not handle:
+            handles[index] = last
+            last.index = index
+            self._sift_up(index)
+            self._sift_down(last.index)
+
+    def _sift_up(self, index):
+        """Moves the entry at index up while its priority belongs above its parent's."""
+        handles = self.handles
+        higher = self.higher
+        handle = handles[index]
+        priority = handle.priority
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_handle = handles[parent]
+            if not higher(priority, parent_handle.priority):
+                break
+            handles[index] = parent_handle
+            parent_handle.index = index
+            index = parent
+        handles[index] = handle
+        handle.index = index
+
+    def _sift_down(self, index):
+        """Moves the entry at index down while a child's priority belongs above it."""
+        handles = self.handles
+        higher = self.higher
+        size = len(handles)
+        handle = handles[index]
+        priority = handle.priority
+        child = 2 * index + 1
+        while child < size:
+            right = child + 1
+            if right < size and higher(handles[right].priority, handles[child].priority):
+                child = right
+            child_handle = handles[child]
+            if not higher(child_handle.priority, priority):
+                break
+            handles[index] = child_handle
+            child_handle.index = index
+            index = child
+            child = 2 * index + 1
+        handles[index] = handle
+        handle.index = index
+
+    def ri_check(self):
+        """Checks if representation invariant (heap order and positions of handles) is preserved."""
+        handles = self.handles
+        for i, handle in enumerate(handles):
+            if handle.index != i:
+                raise RepInvariantError('Incorrect position of a handle.')
+            if i > 0 and self.higher(handle.priority, handles[(i - 1) >> 1].priority):
+                raise RepInvariantError('Representation invariant is not preserved.')
+
+
+def heap_sort(list_to_sort, key=None):
+    """Sorts a list in place (O(1) extra space) in descending order using a heap. 
     
+    The list is turned into a min heap and its top is repeatedly swapped behind the
+    shrinking heap, so the list ends up holding its elements from largest to smallest.
+
     Args:
         list_to_sort: List to sort. 
+        key: Function computing the comparison key of an element (optional).
     Returns: 
-        Sorted list. 
+        The sorted list (the same list object). 
     """
-    aheap = MaxHeap(list_to_sort)
-    result = [] 
-    while aheap.size > 0: 
-        i = aheap.extract_max()
-        result.append(i)
-    return result 
-    
-    
\ No newline at end of file
+    aheap = MaxHeap(list_to_sort, key=key, min_heap=True)
+    alist = aheap.alist
+    for end in range(len(alist) - 1, 0, -1):
+        alist[0], alist[end] = alist[end], alist[0]
+        aheap.size = end
+        aheap._sift_down(0)
+    aheap.size = len(alist)
+    return alist
+
+
+def nlargest(k, iterable, key=None):
+    """Returns the k largest elements of iterable from largest to smallest.
+
+    Consumes iterable as a stream, keeping only a min heap of the k largest elements seen
+    so far, so memory is O(k) regardless of the length of iterable.
+
+    Args:
+        k: Number of elements to return.
+        iterable: Any iterable, e.g. a generator.
+        key: Function computing the comparison key of an element (optional).
+    Returns:
+        List of at most k elements.
+    """
+    if k <= 0:
+        return []
+    # Entries are (key, -order, value): among equal keys the earliest element ranks highest,
+    # as in sorted(iterable, key=key, reverse=True)[:k], and values are never compared.
+    iterator = enumerate(iterable)
+    aheap = MaxHeap([], min_heap=True)
+    for order, value in iterator:
+        aheap.insert((value if key is None else key(value), -order, value))
+        if aheap.size == k:
+            break
+    alist = aheap.alist
+    if alist:
+        top_key = alist[0][0]
+        if key is None:
+            for order, value in iterator:
+                if top_key < value:
+                    aheap.replace_max((value, -order, value))
+                    top_key = alist[0][0]
+        else:
+            for order, value in iterator:
+                value_key = key(value)
+                if top_key < value_key:
+                    aheap.replace_max((value_key, -order, value))
+                    top_key = alist[0][0]
+    return [entry[2] for entry in heap_sort(alist)]
+
+
+def merge(*iterables, key=None, reverse=False):
+    """Lazily merges sorted iterables into a single sorted stream (k-way merge).
+
+    A heap holds one buffered element per unexhausted input, so memory is O(k) for k
+    inputs and every yielded element costs O(log k) time. Equal elements are yielded in
+    the order of the inputs they come from.
+
+    Args:
+        iterables: Iterables, each sorted by key (in descending order if reverse is True).
+        key: Function computing the comparison key of an element (optional).
+        reverse: If True, the inputs and the output are sorted from largest to smallest.
+    Yields:
+        The elements of all iterables in sorted order.
+    """
+    direction = -1 if reverse else 1
+    entries = []  # [key, order, value, next] or [value, order, next] if there is no key
+    for order, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for value in iterator:
+            if key is None:
+                entries.append([value, order * direction, iterator.__next__])
+            else:
+                entries.append([key(value), order * direction, value, iterator.__next__])
+            break
+    aheap = MaxHeap(entries, min_heap=not reverse)
+    value_index = 0 if key is None else 2
+    while aheap.size > 1:
+        entry = entries[0]
+        yield entry[value_index]
+        try:
+            value = entry[-1]()
+        except StopIteration:
+            aheap.extract_max()
+            continue
+        if key is None:
+            entry[0] = value
+        else:
+            entry[0] = key(value)
+            entry[2] = value
+        aheap._sift_down(0)
+    if entries:
+        entry = entries[0]
+        yield entry[value_index]
+        next_value = entry[-1]
+        while True:
+            try:
+                yield next_value()
+            except StopIteration:
+                return
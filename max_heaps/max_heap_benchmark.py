@@ -0,0 +1,69 @@
+"""
+
+Benchmark of MaxHeap against heapq
+
+Builds a heap from n random numbers, then performs n inserts followed by n extractions.
+heapq is a min heap, so it is compared with MaxHeap(min_heap=True); the max mode and the
+key-function mode of MaxHeap are reported as well.
+
+Usage: python max_heap_benchmark.py [--n N]
+
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+from max_heap import MaxHeap
+
+
+def bench_max_heap(data, **kwargs):
+    """Returns (build, insert, extract) times in seconds for MaxHeap."""
+    start = time.perf_counter()
+    aheap = MaxHeap(list(data), **kwargs)
+    build = time.perf_counter() - start
+    aheap = MaxHeap([], **kwargs)
+    insert = aheap.insert
+    start = time.perf_counter()
+    for x in data:
+        insert(x)
+    inserted = time.perf_counter()
+    extract_max = aheap.extract_max
+    for _ in data:
+        extract_max()
+    return build, inserted - start, time.perf_counter() - inserted
+
+
+def bench_heapq(data):
+    """Returns (build, insert, extract) times in seconds for heapq."""
+    start = time.perf_counter()
+    heapq.heapify(list(data))
+    build = time.perf_counter() - start
+    aheap = []
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    start = time.perf_counter()
+    for x in data:
+        heappush(aheap, x)
+    inserted = time.perf_counter()
+    for _ in data:
+        heappop(aheap)
+    return build, inserted - start, time.perf_counter() - inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=1000000)
+    args = parser.parse_args()
+    data = [random.random() for _ in range(args.n)]
+    print('{:<22} {:>9} {:>9} {:>9}'.format('n = {}'.format(args.n), 'build s', 'insert s', 'extract s'))
+    for name, times in (('heapq', bench_heapq(data)),
+                        ('MaxHeap(min_heap=True)', bench_max_heap(data, min_heap=True)),
+                        ('MaxHeap', bench_max_heap(data)),
+                        ('MaxHeap(key=abs)', bench_max_heap(data, key=abs))):
+        print('{:<22} {:>9.3f} {:>9.3f} {:>9.3f}'.format(name, *times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import random
+import unittest
+import max_heap
+import priority_queue
+
+
+class SimpleCasesMaxHeap(unittest.TestCase):
+
+    def test_max_heap(self):
+        """Tests MaxHeap insert/extract_max/peek and heap_sort"""
+        rng = random.Random(0)
+        alist = [rng.randrange(100) for _ in range(200)]
+        aheap = max_heap.MaxHeap(list(alist))
+        aheap.ri_check()
+        for value in range(50):
+            aheap.insert(value)
+            alist.append(value)
+        aheap.ri_check()
+        self.assertEqual(len(aheap), 250)
+        self.assertEqual(aheap.peek(), max(alist))
+        self.assertEqual([aheap.extract_max() for _ in range(250)], sorted(alist, reverse=True))
+        self.assertRaises(IndexError, aheap.peek)
+        self.assertEqual(max_heap.heap_sort([3, 1, 2]), [3, 2, 1])
+
+    def test_max_heap_key_and_min_heap(self):
+        """Tests MaxHeap with a key function and in min-heap mode"""
+        rng = random.Random(2)
+        words = ['w' * rng.randrange(1, 30) + str(i) for i in range(300)]
+        aheap = max_heap.MaxHeap(list(words[:100]), key=len)
+        for word in words[100:]:
+            aheap.insert(word)
+        aheap.ri_check()
+        self.assertEqual([len(aheap.extract_max()) for _ in range(300)], sorted(map(len, words), reverse=True))
+        numbers = [rng.random() for _ in range(300)]
+        aheap = max_heap.MaxHeap([], min_heap=True)
+        for x in numbers:
+            aheap.insert(x)
+        aheap.ri_check()
+        self.assertEqual([aheap.extract_max() for _ in range(300)], sorted(numbers))
+        aheap = max_heap.MaxHeap(list(numbers), key=lambda x: -x, min_heap=True)
+        self.assertEqual(aheap.peek(), max(numbers))
+
+    def test_addressable_max_heap(self):
+        """Tests AddressableMaxHeap update/remove through handles against a dict of priorities"""
+        rng = random.Random(1)
+        aheap = max_heap.AddressableMaxHeap()
+        priorities = {}
+        handles = {}
+        for i in range(3000):
+            op = rng.random()
+            if op < 0.4 or not handles:
+                handles[i] = aheap.insert(i, rng.randrange(1000))
+                priorities[i] = handles[i].priority
+            elif op < 0.7:
+                item = rng.choice(list(handles))
+                priorities[item] = rng.randrange(1000)
+                aheap.update(handles[item], priorities[item])
+            elif op < 0.85:
+                item = rng.choice(list(handles))
+                aheap.remove(handles.pop(item))
+                del priorities[item]
+            else:
+                self.assertEqual(aheap.peek().priority, max(priorities.values()))
+                handle = aheap.extract_max()
+                self.assertEqual(handle.priority, max(priorities.values()))
+                del priorities[handle.item]
+                del handles[handle.item]
+                self.assertRaises(ValueError, aheap.update, handle, 5)
+                self.assertRaises(ValueError, aheap.remove, handle)
+            if i % 100 == 0:
+                aheap.ri_check()
+        aheap.ri_check()
+        self.assertEqual(len(aheap), len(priorities))
+        while len(aheap):
+            handle = aheap.extract_max()
+            self.assertEqual(handle.priority, max(priorities.values()))
+            del priorities[handle.item]
+        self.assertRaises(IndexError, aheap.extract_max)
+
+    def test_priority_queue_engines(self):
+        """Tests every PriorityQueue engine, in max and min mode, against a dict of priorities"""
+        for name, engine in sorted(priority_queue.ENGINES.items()):
+            for min_heap in (False, True):
+                rng = random.Random(3)
+                best = min if min_heap else max
+                aqueue = engine(min_heap=min_heap)
+                priorities = {}
+                handles = {}
+                for i in range(2000):
+                    op = rng.random()
+                    if op < 0.4 or not handles:
+                        handles[i] = aqueue.insert(i, rng.randrange(1000))
+                        priorities[i] = handles[i].priority
+                    elif op < 0.7:
+                        item = rng.choice(list(handles))
+                        priorities[item] = rng.randrange(1000)
+                        aqueue.update(handles[item], priorities[item])
+                    elif op < 0.85:
+                        item = rng.choice(list(handles))
+                        handle = handles.pop(item)
+                        aqueue.remove(handle)
+                        del priorities[item]
+                        self.assertRaises(ValueError, aqueue.remove, handle)
+                    else:
+                        self.assertEqual(aqueue.peek().priority, best(priorities.values()))
+                        handle = aqueue.extract()
+                        self.assertEqual(handle.priority, best(priorities.values()))
+                        del priorities[handle.item]
+                        del handles[handle.item]
+                        self.assertFalse(handle in aqueue)
+                        self.assertRaises(ValueError, aqueue.update, handle, 5)
+                    if i % 100 == 0:
+                        aqueue.ri_check()
+                aqueue.ri_check()
+                self.assertEqual(len(aqueue), len(priorities), name)
+                while len(aqueue):
+                    handle = aqueue.extract()
+                    self.assertEqual(handle.priority, best(priorities.values()), name)
+                    del priorities[handle.item]
+                self.assertRaises(IndexError, aqueue.extract)
+                self.assertRaises(IndexError, aqueue.peek)
+
+        class Incomplete(max_heap.PriorityQueue):  # an engine without update() and remove()
+            __len__ = __contains__ = insert = peek = extract = lambda self, *args: None
+
+        self.assertRaises(TypeError, Incomplete)
+
+    def test_heap_sort_in_place_and_nlargest(self):
+        """Tests the in-place heap_sort and the streaming nlargest"""
+        rng = random.Random(4)
+        for n in (0, 1, 2, 3, 10, 1000):
+            alist = [rng.randrange(100) for _ in range(n)]
+            expected = sorted(alist, reverse=True)
+            result = max_heap.heap_sort(alist)
+            self.assertIs(result, alist)
+            self.assertEqual(alist, expected)
+        words = ['w' * rng.randrange(1, 50) for _ in range(500)]
+        self.assertEqual(list(map(len, max_heap.heap_sort(list(words), key=len))), sorted(map(len, words), reverse=True))
+        numbers = [rng.random() for _ in range(5000)]
+        for k in (0, 1, 7, 5000, 6000):
+            self.assertEqual(max_heap.nlargest(k, iter(numbers)), sorted(numbers, reverse=True)[:k])
+            self.assertEqual(max_heap.nlargest(k, (x for x in numbers), key=lambda x: -x), sorted(numbers)[:k])
+        self.assertEqual(max_heap.nlargest(3, []), [])
+        pairs = [(1, 'a'), (1, 'b'), (2, 'c'), (1, 'd'), (2, 'e')]
+        for k in range(len(pairs) + 1):  # ties keep the earliest element
+            expected = sorted(pairs, key=lambda t: t[0], reverse=True)[:k]
+            self.assertEqual(max_heap.nlargest(k, pairs, key=lambda t: t[0]), expected)
+
+    def test_merge(self):
+        """Tests the lazy k-way merge against sorting the concatenated inputs"""
+        rng = random.Random(5)
+        shards = [sorted(rng.randrange(100) for _ in range(rng.randrange(50))) for _ in range(20)]
+        concatenated = [x for shard in shards for x in shard]
+        self.assertEqual(list(max_heap.merge(*map(iter, shards))), sorted(concatenated))
+        self.assertEqual(list(max_heap.merge(*[shard[::-1] for shard in shards], reverse=True)),
+                         sorted(concatenated, reverse=True))
+        tagged = [sorted(((x, i) for x in shard), key=lambda t: -t[0]) for i, shard in enumerate(shards)]
+        merged = list(max_heap.merge(*tagged, key=lambda t: -t[0]))
+        self.assertEqual(merged, sorted((t for shard in tagged for t in shard), key=lambda t: -t[0]))  # stable
+        self.assertEqual(list(max_heap.merge()), [])
+        self.assertEqual(list(max_heap.merge([], [1, 2], [])), [1, 2])
+        stream = max_heap.merge(iter(range(0, 10 ** 9, 2)), iter(range(1, 10 ** 9, 2)))
+        self.assertEqual([next(stream) for _ in range(5)], [0, 1, 2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+
+Benchmark of the k-way merge of sorted shards
+
+Compares max_heap.merge against heapq.merge, concatenate-then-sorted() and
+concatenate-then-heap_sort on k sorted shards of m random numbers each.
+
+Usage: python merge_benchmark.py [--k K] [--m M]
+
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+import max_heap
+
+
+def consume(iterator):
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--k', type=int, default=300)
+    parser.add_argument('--m', type=int, default=3000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    shards = [sorted(rng.random() for _ in range(args.m)) for _ in range(args.k)]
+    methods = (
+        ('max_heap.merge', lambda: consume(max_heap.merge(*shards))),
+        ('heapq.merge', lambda: consume(heapq.merge(*shards))),
+        ('concatenate + sorted', lambda: len(sorted(x for shard in shards for x in shard))),
+        ('concatenate + heap_sort', lambda: len(max_heap.heap_sort([x for shard in shards for x in shard]))),
+    )
+    n = args.k * args.m
+    print('k = {}, m = {} ({} elements)'.format(args.k, args.m, n))
+    for name, run in methods:
+        start = time.perf_counter()
+        assert run() == n
+        elapsed = time.perf_counter() - start
+        print('{:<24} {:8.3f} s {:>12,.0f} elements/s'.format(name, elapsed, n / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+
+Addressable priority queue engines sharing the max_heap.PriorityQueue interface
+
+- AddressableMaxHeap (max_heap.py): binary heap; O(log n) insert, extract, update, remove
+
+- DaryHeap: heap with d children per node; O(log_d n) insert and priority increase,
+  O(d log_d n) extract; the shallower tree suits workloads with many inserts and
+  priority increases (e.g. decrease-key in Dijkstra's algorithm with min_heap=True)
+
+- PairingHeap: heap-ordered multiway tree; O(1) insert and meld, O(log n) amortized
+  extract and remove, o(log n) amortized priority increase
+
+"""
+
+from max_heap import AddressableMaxHeap, PriorityQueue, RepInvariantError
+
+
+class DaryHeap(AddressableMaxHeap):
+    """A d-ary max heap (or min heap) of (item, priority) entries addressed by handles."""
+
+    def __init__(self, d=4, min_heap=False):
+        """Creates an empty heap.
+
+        Args:
+            d: Number of children per node (at least 2).
+            min_heap: If True, the entry with the smallest priority is on top instead.
+        """
+        if d < 2:
+            raise ValueError('A d-ary heap needs d >= 2.')
+        AddressableMaxHeap.__init__(self, min_heap)
+        self.d = d
+
+    def _sift_up(self, index):
+        """Moves the entry at index up while its priority belongs above its parent's."""
+        handles = self.handles
+        higher = self.higher
+        d = self.d
+        handle = handles[index]
+        priority = handle.priority
+        while index > 0:
+            parent = (index - 1) // d
+            parent_handle = handles[parent]
+            if not higher(priority, parent_handle.priority):
+                break
+            handles[index] = parent_handle
+            parent_handle.index = index
+            index = parent
+        handles[index] = handle
+        handle.index = index
+
+    def _sift_down(self, index):
+        """Moves the entry at index down while a child's priority belongs above it."""
+        handles = self.handles
+        higher = self.higher
+        d = self.d
+        size = len(handles)
+        handle = handles[index]
+        priority = handle.priority
+        first = d * index + 1
+        while first < size:
+            best = first
+            best_priority = handles[first].priority
+            for child in range(first + 1, min(first + d, size)):
+                child_priority = handles[child].priority
+                if higher(child_priority, best_priority):
+                    best, best_priority = child, child_priority
+            if not higher(best_priority, priority):
+                break
+            child_handle = handles[best]
+            handles[index] = child_handle
+            child_handle.index = index
+            index = best
+            first = d * index + 1
+        handles[index] = handle
+        handle.index = index
+
+    def ri_check(self):
+        """Checks if representation invariant (heap order and positions of handles) is preserved."""
+        handles = self.handles
+        for i, handle in enumerate(handles):
+            if handle.index != i:
+                raise RepInvariantError('Incorrect position of a handle.')
+            if i > 0 and self.higher(handle.priority, handles[(i - 1) // self.d].priority):
+                raise RepInvariantError('Representation invariant is not preserved.')
+
+
+class PairingNode(object):
+    """A node of PairingHeap, which also serves as the handle of its entry.
+
+    Attributes:
+        item: Item stored in the entry.
+        priority: Priority of the item.
+        child: The leftmost child; None if the node has no children.
+        sibling: The next sibling to the right; None if the node is the rightmost child.
+        prev: The left sibling, or the parent for the leftmost child; None for the root
+            and for nodes not in the heap.
+    """
+
+    __slots__ = ('item', 'priority', 'child', 'sibling', 'prev')
+
+    def __init__(self, item, priority):
+        """Creates a node."""
+        self.item = item
+        self.priority = priority
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+
+class PairingHeap(PriorityQueue):
+    """A pairing max heap (or min heap) of (item, priority) entries addressed by handles."""
+
+    def __init__(self, min_heap=False):
+        """Creates an empty heap."""
+        PriorityQueue.__init__(self, min_heap)
+        self.root = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, handle):
+        return handle.prev is not None or handle is self.root
+
+    def _meld(self, a, b):
+        """Links the trees rooted at a and b (either may be None); returns the new root."""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if self.higher(b.priority, a.priority):
+            a, b = b, a
+        b.prev = a  # b becomes the leftmost child of a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        a.sibling = None
+        a.prev = None
+        return a
+
+    def _merge_pairs(self, first):
+        """Melds a list of siblings starting at first by the two-pass rule; returns the new root."""
+        pairs = []
+        while first is not None:
+            second = first.sibling
+            if second is None:
+                first.prev = None
+                pairs.append(first)
+                break
+            following = second.sibling
+            first.sibling = second.sibling = first.prev = second.prev = None
+            pairs.append(self._meld(first, second))
+            first = following
+        root = None
+        for tree in reversed(pairs):
+            root = self._meld(tree, root)
+        return root
+
+    def _cut(self, node):
+        """Detaches the subtree rooted at node (which is not the root) from its parent."""
+        prev = node.prev
+        if prev.child is node:
+            prev.child = node.sibling
+        else:
+            prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = prev
+        node.prev = node.sibling = None
+
+    def insert(self, item, priority):
+        """Inserts item with priority into the heap in O(1) time.
+
+        Returns:
+            Handle of the new entry.
+        """
+        node = PairingNode(item, priority)
+        self.root = self._meld(self.root, node)
+        self.size += 1
+        return node
+
+    def peek(self):
+        """Returns the handle of the entry on top.
+
+        Raises:
+            IndexError if the heap is empty.
+        """
+        if self.root is None:
+            raise IndexError('peek from empty heap')
+        return self.root
+
+    def extract(self):
+        """Removes and returns the handle of the entry on top.
+
+        Raises:
+            IndexError if the heap is empty.
+        """
+        root = self.root
+        if root is None:
+            raise IndexError('extract from empty heap')
+        self.root = self._merge_pairs(root.child)
+        root.child = None
+        self.size -= 1
+        return root
+
+    def update(self, handle, priority):
+        """Changes the priority of the entry of handle.
+
+        Raises:
+            ValueError if the entry is not in the heap.
+        """
+        if handle not in self:
+            raise ValueError('Handle is not in the heap.')
+        old_priority = handle.priority
+        handle.priority = priority
+        if self.higher(priority, old_priority):
+            if handle is not self.root:
+                self._cut(handle)
+                self.root = self._meld(self.root, handle)
+        else:
+            handle.priority = old_priority
+            self.remove(handle)
+            handle.priority = priority
+            self.root = self._meld(self.root, handle)
+            self.size += 1
+
+    def remove(self, handle):
+        """Removes the entry of handle from the heap.
+
+        Raises:
+            ValueError if the entry is not in the heap.
+        """
+        if handle not in self:
+            raise ValueError('Handle is not in the heap.')
+        if handle is self.root:
+            self.extract()
+            return
+        self._cut(handle)
+        subtree = self._merge_pairs(handle.child)
+        handle.child = None
+        self.root = self._meld(self.root, subtree)
+        self.size -= 1
+
+    def ri_check(self):
+        """Checks if representation invariant (heap order, links and size) is preserved."""
+        count = 0
+        stack = [self.root] if self.root is not None else []
+        if self.root is not None and (self.root.prev is not None or self.root.sibling is not None):
+            raise RepInvariantError('Root has a parent or a sibling.')
+        while stack:
+            node = stack.pop()
+            count += 1
+            prev = node
+            child = node.child
+            while child is not None:
+                if child.prev is not prev:
+                    raise RepInvariantError('Incorrect prev pointer.')
+                if self.higher(child.priority, node.priority):
+                    raise RepInvariantError('Representation invariant is not preserved.')
+                stack.append(child)
+                prev = child
+                child = child.sibling
+        if count != self.size:
+            raise RepInvariantError('Incorrect size.')
+
+
+ENGINES = {
+    'binary': AddressableMaxHeap,
+    '4-ary': lambda min_heap=False: DaryHeap(4, min_heap),
+    '8-ary': lambda min_heap=False: DaryHeap(8, min_heap),
+    'pairing': PairingHeap,
+}
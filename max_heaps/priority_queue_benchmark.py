@@ -0,0 +1,91 @@
+"""
+
+Benchmark of the PriorityQueue engines (binary, d-ary and pairing heaps)
+
+Workloads:
+
+- insert-heavy: n inserts with one extraction after every 20 inserts
+
+- extract-heavy: n inserts followed by n extractions
+
+- dijkstra: Dijkstra's shortest paths (min_heap=True) on a random graph with n vertices
+  and 8n edges, using update() as decrease-key
+
+Usage: python priority_queue_benchmark.py [--n N] [--engines binary 4-ary 8-ary pairing]
+
+"""
+
+import argparse
+import random
+import time
+
+from priority_queue import ENGINES
+
+
+def insert_heavy(engine, priorities):
+    aqueue = engine()
+    for i, priority in enumerate(priorities):
+        aqueue.insert(i, priority)
+        if i % 20 == 19:
+            aqueue.extract()
+
+
+def extract_heavy(engine, priorities):
+    aqueue = engine()
+    for i, priority in enumerate(priorities):
+        aqueue.insert(i, priority)
+    for _ in priorities:
+        aqueue.extract()
+
+
+def make_graph(n, degree, rng):
+    """Returns adjacency lists of a random directed graph with non-negative edge weights."""
+    return [[(rng.randrange(n), rng.random()) for _ in range(degree)] for _ in range(n)]
+
+
+def dijkstra(engine, graph, source=0):
+    """Returns the list of shortest distances from source (float('inf') if unreachable)."""
+    aqueue = engine(min_heap=True)
+    distances = [float('inf')] * len(graph)
+    distances[source] = 0.0
+    handles = {source: aqueue.insert(source, 0.0)}
+    while len(aqueue):
+        handle = aqueue.extract()
+        u = handle.item
+        du = handle.priority
+        for v, weight in graph[u]:
+            dv = du + weight
+            if dv < distances[v]:
+                distances[v] = dv
+                if v in handles:
+                    aqueue.update(handles[v], dv)
+                else:
+                    handles[v] = aqueue.insert(v, dv)
+    return distances
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=200000)
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=['binary', '4-ary', '8-ary', 'pairing'])
+    args = parser.parse_args()
+    rng = random.Random(0)
+    priorities = [rng.random() for _ in range(args.n)]
+    graph = make_graph(args.n, 8, rng)
+    workloads = (
+        ('insert-heavy', lambda engine: insert_heavy(engine, priorities)),
+        ('extract-heavy', lambda engine: extract_heavy(engine, priorities)),
+        ('dijkstra', lambda engine: dijkstra(engine, graph)),
+    )
+    print('{:<10}'.format('n = {}'.format(args.n)) + ''.join('{:>15}'.format(name) for name, _ in workloads))
+    for name in args.engines:
+        times = []
+        for _, run in workloads:
+            start = time.perf_counter()
+            run(ENGINES[name])
+            times.append(time.perf_counter() - start)
+        print('{:<10}'.format(name) + ''.join('{:>13.3f} s'.format(t) for t in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+
+from stack_and_queue import OverflowError, RingDeque, UnderflowError
+
+
+class BoundedQueue(object):
+    """Thread-safe bounded FIFO queue on RingDeque storage.
+
+    Producers block in put while the queue is full and consumers block in get while it
+    is empty, so a fast stage is slowed down to the pace of the stage after it instead
+    of growing the queue without bound.
+    """
+
+    def __init__(self, maxsize):
+        """Creates an empty queue.
+
+        Args:
+            maxsize: Maximum number of items in the queue.
+        """
+        assert maxsize > 0
+        self.maxsize = maxsize
+        self.items = RingDeque()
+        lock = threading.Lock()
+        self.not_empty = threading.Condition(lock)
+        self.not_full = threading.Condition(lock)
+
+    def __len__(self):
+        return len(self.items)
+
+    def empty(self):
+        """Tests whether the queue is empty."""
+        return self.items.empty()
+
+    def full(self):
+        """Tests whether the queue is full."""
+        return len(self.items) >= self.maxsize
+
+    def put(self, item, timeout=None):
+        """Inserts an item to the queue, waiting for a free slot if the queue is full.
+
+        Args:
+            item: Item to be inserted.
+            timeout: Maximum number of seconds to wait (optional, wait forever by default).
+        Raises:
+            OverflowError if the queue is still full after timeout seconds.
+        """
+        with self.not_full:
+            if not self.not_full.wait_for(lambda: len(self.items) < self.maxsize, timeout):
+                raise OverflowError
+            self.items.append(item)
+            self.not_empty.notify()
+
+    def get(self, timeout=None):
+        """Deletes an item from the queue, waiting for one if the queue is empty.
+
+        Args:
+            timeout: Maximum number of seconds to wait (optional, wait forever by default).
+        Returns:
+            The deleted item.
+        Raises:
+            UnderflowError if the queue is still empty after timeout seconds.
+        """
+        with self.not_empty:
+            if not self.not_empty.wait_for(lambda: self.items.size, timeout):
+                raise UnderflowError
+            item = self.items.popleft()
+            self.not_full.notify()
+            return item
+
+    def get_batch(self, max_n, timeout=None):
+        """Deletes up to max_n items from the queue under a single lock acquisition, waiting
+        for at least one item if the queue is empty.
+
+        Args:
+            max_n: Maximum number of items to delete.
+            timeout: Maximum number of seconds to wait (optional, wait forever by default).
+        Returns:
+            List of the deleted items, oldest first; empty if the queue is still empty after
+            timeout seconds.
+        Raises:
+            ValueError if max_n is smaller than 1.
+        """
+        if max_n < 1:
+            raise ValueError('max_n must be at least 1, got {}'.format(max_n))
+        with self.not_empty:
+            if not self.not_empty.wait_for(lambda: self.items.size, timeout):
+                return []
+            items = self.items.drain(max_n)
+            self.not_full.notify(len(items))
+            return items
+
+    def put_nowait(self, item):
+        """Inserts an item to the queue; raises OverflowError if the queue is full."""
+        self.put(item, 0)
+
+    def get_nowait(self):
+        """Deletes an item from the queue; raises UnderflowError if the queue is empty."""
+        return self.get(0)
+
+
+async def _wait_for(condition, predicate, timeout):
+    """Waits on an asyncio condition (whose lock is held) until predicate is true.
+
+    Returns:
+        False if timeout seconds passed before predicate became true, True otherwise.
+    """
+    if predicate():
+        return True
+    if timeout is None:
+        await condition.wait_for(predicate)
+        return True
+    try:
+        await asyncio.wait_for(condition.wait_for(predicate), timeout)
+    except asyncio.TimeoutError:
+        return predicate()
+    return True
+
+
+class AsyncBoundedQueue(object):
+    """Bounded FIFO queue on RingDeque storage for asyncio tasks of a single event loop.
+
+    The asyncio counterpart of BoundedQueue: put and get are coroutines that suspend the
+    calling task (instead of blocking the thread) while the queue is full or empty.
+    """
+
+    def __init__(self, maxsize):
+        """Creates an empty queue.
+
+        Args:
+            maxsize: Maximum number of items in the queue.
+        """
+        assert maxsize > 0
+        self.maxsize = maxsize
+        self.items = RingDeque()
+        lock = asyncio.Lock()
+        self.not_empty = asyncio.Condition(lock)
+        self.not_full = asyncio.Condition(lock)
+
+    def __len__(self):
+        return len(self.items)
+
+    def empty(self):
+        """Tests whether the queue is empty."""
+        return self.items.empty()
+
+    def full(self):
+        """Tests whether the queue is full."""
+        return len(self.items) >= self.maxsize
+
+    async def put(self, item, timeout=None):
+        """Inserts an item to the queue, waiting for a free slot if the queue is full.
+
+        Args:
+            item: Item to be inserted.
+            timeout: Maximum number of seconds to wait (optional, wait forever by default).
+        Raises:
+            OverflowError if the queue is still full after timeout seconds.
+        """
+        async with self.not_full:
+            if not await _wait_for(self.not_full, lambda: len(self.items) < self.maxsize, timeout):
+                raise OverflowError
+            self.items.append(item)
+            self.not_empty.notify()
+
+    async def get(self, timeout=None):
+        """Deletes an item from the queue, waiting for one if the queue is empty.
+
+        Args:
+            timeout: Maximum number of seconds to wait (optional, wait forever by default).
+        Returns:
+            The deleted item.
+        Raises:
+            UnderflowError if the queue is still empty after timeout seconds.
+        """
+        async with self.not_empty:
+            if not await _wait_for(self.not_empty, lambda: self.items.size, timeout):
+                raise UnderflowError
+            item = self.items.popleft()
+            self.not_full.notify()
+            return item
+
+    async def get_batch(self, max_n, timeout=None):
+        """Deletes up to max_n items from the queue, waiting for at least one item if the
+        queue is empty.
+
+        Args:
+            max_n: Maximum number of items to delete.
+            timeout: Maximum number of seconds to wait (optional, wait forever by default).
+        Returns:
+            List of the deleted items, oldest first; empty if the queue is still empty after
+            timeout seconds.
+        Raises:
+            ValueError if max_n is smaller than 1.
+        """
+        if max_n < 1:
+            raise ValueError('max_n must be at least 1, got {}'.format(max_n))
+        async with self.not_empty:
+            if not await _wait_for(self.not_empty, lambda: self.items.size, timeout):
+                return []
+            items = self.items.drain(max_n)
+            self.not_full.notify(len(items))
+            return items
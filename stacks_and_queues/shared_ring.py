@@ -0,0 +1,261 @@
+import platform
+from multiprocessing import shared_memory
+
+from stack_and_queue import OverflowError, UnderflowError
+
+# Layout of the shared block, in 8-byte words: the write and read indices sit on separate
+# cache lines so that the producer and the consumer do not invalidate each other's line
+# on every update; the data region starts after the header.
+WRITE, READ, CAPACITY, RECORD_SIZE = 0, 8, 16, 17
+HEADER = 256
+WRAP = 0xFFFFFFFF  # length of the marker frame that sends the reader back to offset 0
+PREFIX = 4  # bytes of the length prefix of a frame
+
+
+X86_64 = ('x86_64', 'amd64')  # values of platform.machine() on which the buffer is safe
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _check_platform():
+    machine = platform.machine()
+    if machine.lower() not in X86_64:
+        raise RuntimeError('SharedRingBuffer relies on x86-64 store ordering; not safe on {}'.format(machine))
+
+
+class SharedRingBuffer(object):
+    """Single-producer/single-consumer ring buffer in a multiprocessing.shared_memory block.
+
+    The QueueArray design with read and write indices, shared by two processes: the
+    producer only writes the write index and the consumer only writes the read index, so
+    no lock is needed. The indices are byte counters that only grow (positions are taken
+    modulo the capacity), hence no slot is wasted to tell a full buffer from an empty one.
+    Each index is published with a single aligned 8-byte store after the data it covers,
+    which is enough on x86-64 (stores are not reordered with other stores). There are no
+    memory barriers, so the buffer is only safe on x86-64: on weakly ordered CPUs (ARM,
+    POWER, ...) the consumer could see an index before the data it covers, and create and
+    attach raise RuntimeError there.
+
+    Items are bytes-like objects stored either as fixed-size records (record_size given) or
+    as frames with a 4-byte (native order) length prefix, padded to 8 bytes. A frame never wraps around
+    the end of the buffer (a marker frame skips the tail instead), so readers get every
+    item as a contiguous memoryview into shared memory without copying.
+    """
+
+    def __init__(self, shm, owner):
+        """Wraps a shared memory block whose header is initialized; use create or attach."""
+        self.shm = shm
+        self.owner = owner
+        self.indices = shm.buf[:HEADER].cast('Q')
+        self.capacity = self.indices[CAPACITY]
+        self.record_size = self.indices[RECORD_SIZE] or None
+        self.data = shm.buf[HEADER:HEADER + self.capacity]
+        # Length prefixes of frames (at 8-byte aligned positions) as 4-byte words.
+        self.prefixes = self.data.cast('I') if self.record_size is None else None
+        self.name = shm.name
+        # Local copies of the indices: each side re-reads the other side's index only when
+        # the buffer looks full (producer) or empty (consumer). The consumer keeps its own
+        # copy of the write index (published), so that an instance used as both producer and
+        # consumer never reads items written by _put but not published yet.
+        self.write = self.published = self.indices[WRITE]
+        self.read = self.indices[READ]
+        self.peeked = self.read
+
+    @classmethod
+    def create(cls, capacity, record_size=None, name=None):
+        """Creates a ring buffer in a new shared memory block.
+
+        Args:
+            capacity: Size of the data region in bytes (rounded up to whole records or to 8 bytes).
+            record_size: Size of the fixed-size records in bytes (optional, length-prefixed frames by default).
+            name: Name of the shared memory block (optional, a random name by default).
+        Returns:
+            The ring buffer; it unlinks the block when closed.
+        Raises:
+            RuntimeError if the machine is not x86-64.
+        """
+        _check_platform()
+        if record_size is not None:
+            assert record_size > 0
+            capacity = -(-capacity // record_size) * record_size
+        else:
+            capacity = _align(capacity)
+        assert capacity > 0
+        shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER + capacity)
+        indices = shm.buf[:HEADER].cast('Q')
+        indices[WRITE] = indices[READ] = 0
+        indices[CAPACITY] = capacity
+        indices[RECORD_SIZE] = record_size or 0
+        indices.release()
+        return cls(shm, True)
+
+    @classmethod
+    def attach(cls, name):
+        """Attaches to the ring buffer in the shared memory block called name (e.g. in another
+        process); raises RuntimeError if the machine is not x86-64."""
+        _check_platform()
+        return cls(shared_memory.SharedMemory(name=name), False)
+
+    def close(self):
+        """Detaches from the shared memory block (and unlinks it if this side created it).
+        Views returned by peek_many must be released first."""
+        self.indices.release()
+        if self.prefixes is not None:
+            self.prefixes.release()
+        self.data.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def used_bytes(self):
+        """Returns the number of bytes of the data region in use (including prefixes and padding)."""
+        return self.indices[WRITE] - self.indices[READ]
+
+    def empty(self):
+        """Tests whether the buffer is empty."""
+        return self.indices[WRITE] == self.indices[READ]
+
+    def _check_size(self, n):
+        """Raises ValueError if an item of n bytes cannot be stored in this buffer."""
+        if self.record_size is not None:
+            if n != self.record_size:
+                raise ValueError('Record of {} bytes, expected {}'.format(n, self.record_size))
+        elif _align(PREFIX + n) > self.capacity // 2:
+            raise ValueError('Frame of {} bytes does not fit in a buffer of {} bytes'.format(n, self.capacity))
+
+    def _put(self, data):
+        """Copies one item (of a size checked by _check_size) after the local write index;
+        returns False if there is no room."""
+        n = len(data)
+        capacity = self.capacity
+        write = self.write
+        position = write % capacity
+        if self.record_size is not None:
+            if write + n - self.read > capacity:
+                self.read = self.indices[READ]
+                if write + n - self.read > capacity:
+                    return False
+            self.data[position:position + n] = data
+            self.write = write + n
+            return True
+        size = _align(PREFIX + n)
+        skip = capacity - position if position + size > capacity else 0
+        if write + skip + size - self.read > capacity:
+            self.read = self.indices[READ]
+            if write + skip + size - self.read > capacity:
+                return False
+        if skip:
+            self.prefixes[position >> 2] = WRAP
+            position = 0
+        self.prefixes[position >> 2] = n
+        self.data[position + PREFIX:position + PREFIX + n] = data
+        self.write = write + skip + size
+        return True
+
+    def enqueue(self, data):
+        """Inserts an item to the buffer (producer side).
+
+        Args:
+            data: Bytes-like item.
+        Raises:
+            OverflowError if the buffer is full.
+            ValueError if the item has the wrong size for a record, or is larger than half
+            the buffer for a frame.
+        """
+        self._check_size(len(data))
+        if not self._put(data):
+            raise OverflowError
+        self.indices[WRITE] = self.write
+
+    def enqueue_many(self, items):
+        """Inserts items to the buffer and publishes them with a single index update (producer side).
+
+        Args:
+            items: Sequence of bytes-like items.
+        Returns:
+            The number of items inserted (from the front of items), which is smaller than
+            len(items) when the buffer fills up.
+        Raises:
+            ValueError if some item has the wrong size for a record, or is larger than half
+            the buffer for a frame; all sizes are checked first, so no item is inserted then.
+        """
+        for data in items:
+            self._check_size(len(data))
+        count = 0
+        for data in items:
+            if not self._put(data):
+                break
+            count += 1
+        self.indices[WRITE] = self.write
+        return count
+
+    def peek_many(self, max_n=None):
+        """Returns up to max_n items after the ones already peeked, without copying them
+        (consumer side). The memoryviews point into shared memory and stay valid until
+        release is called; they have to be released (or dropped) before close.
+
+        Args:
+            max_n: Maximum number of items (optional, all available items by default).
+        Returns:
+            List of memoryviews of the items, oldest first.
+        """
+        views = []
+        data = self.data
+        capacity = self.capacity
+        record_size = self.record_size
+        prefixes = self.prefixes
+        read = self.peeked
+        write = self.published
+        refreshed = False
+        while max_n is None or len(views) < max_n:
+            if read == write:
+                if refreshed:
+                    break
+                write = self.published = self.indices[WRITE]
+                refreshed = True
+                continue
+            position = read % capacity
+            if record_size is not None:
+                views.append(data[position:position + record_size])
+                read += record_size
+                continue
+            n = prefixes[position >> 2]
+            if n == WRAP:
+                read += capacity - position
+                continue
+            views.append(data[position + PREFIX:position + PREFIX + n])
+            read += _align(PREFIX + n)
+        self.peeked = read
+        return views
+
+    def release(self):
+        """Frees the space of all peeked items for the producer (consumer side)."""
+        self.read = self.peeked
+        self.indices[READ] = self.read
+
+    def dequeue_many(self, max_n=None):
+        """Deletes up to max_n items from the buffer with a single index update (consumer side).
+
+        Args:
+            max_n: Maximum number of items (optional, all available items by default).
+        Returns:
+            List of the deleted items as bytes, oldest first.
+        """
+        items = [bytes(view) for view in self.peek_many(max_n)]
+        self.release()
+        return items
+
+    def dequeue(self):
+        """Deletes an item from the buffer (consumer side).
+
+        Returns:
+            The deleted item as bytes.
+        Raises:
+            UnderflowError if the buffer is empty.
+        """
+        items = self.dequeue_many(1)
+        if not items:
+            raise UnderflowError
+        return items[0]
@@ -0,0 +1,128 @@
+"""
+
+Benchmark of SharedRingBuffer against multiprocessing.Queue
+
+A producer process sends --n messages of --size bytes to a consumer process, which
+touches every message; the time from the start of the producer until the consumer has
+received the last message gives messages per second. Transports:
+
+- mp.Queue: multiprocessing.Queue.put / get
+
+- ring: SharedRingBuffer.enqueue / dequeue, one message at a time (length-prefixed frames)
+
+- ring-batch: enqueue_many / peek_many + release in batches of --batch messages
+
+- ring-records: as ring-batch, with fixed-size records instead of frames
+
+Both sides spin (yielding the processor) when the ring buffer is full or empty.
+
+Usage: python shared_ring_benchmark.py [--n N] [--size BYTES] [--batch B] [--capacity BYTES]
+
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+
+from shared_ring import SharedRingBuffer
+from stack_and_queue import OverflowError, UnderflowError
+
+
+def queue_consumer(aqueue, n, done):
+    for _ in range(n):
+        message = aqueue.get()
+        message[0]
+    done.put(time.perf_counter())
+
+
+def ring_consumer(name, n, batch, done):
+    ring = SharedRingBuffer.attach(name)
+    received = 0
+    if batch == 1:
+        while received < n:
+            try:
+                message = ring.dequeue()
+            except UnderflowError:
+                os.sched_yield()
+                continue
+            message[0]
+            received += 1
+    else:
+        while received < n:
+            views = ring.peek_many(batch)
+            if not views:
+                os.sched_yield()
+                continue
+            for view in views:
+                view[0]
+            received += len(views)
+            del view, views
+            ring.release()
+    done.put(time.perf_counter())
+    ring.close()
+
+
+def run_queue(n, message):
+    aqueue = multiprocessing.Queue()
+    done = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=queue_consumer, args=(aqueue, n, done))
+    consumer.start()
+    start = time.perf_counter()
+    for _ in range(n):
+        aqueue.put(message)
+    end = done.get()
+    consumer.join()
+    return n / (end - start)
+
+
+def run_ring(n, message, batch, capacity, record_size=None):
+    ring = SharedRingBuffer.create(capacity, record_size)
+    done = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=ring_consumer, args=(ring.name, n, batch, done))
+    consumer.start()
+    start = time.perf_counter()
+    if batch == 1:
+        sent = 0
+        while sent < n:
+            try:
+                ring.enqueue(message)
+            except OverflowError:
+                os.sched_yield()
+                continue
+            sent += 1
+    else:
+        messages = [message] * batch
+        sent = 0
+        while sent < n:
+            count = ring.enqueue_many(messages[:n - sent])
+            if count == 0:
+                os.sched_yield()
+            sent += count
+    end = done.get()
+    consumer.join()
+    ring.close()
+    return n / (end - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=200000)
+    parser.add_argument('--size', type=int, default=64)
+    parser.add_argument('--batch', type=int, default=64)
+    parser.add_argument('--capacity', type=int, default=1 << 20)
+    args = parser.parse_args()
+    message = os.urandom(args.size)
+    transports = (
+        ('mp.Queue', lambda: run_queue(args.n, message)),
+        ('ring', lambda: run_ring(args.n, message, 1, args.capacity)),
+        ('ring-batch', lambda: run_ring(args.n, message, args.batch, args.capacity)),
+        ('ring-records', lambda: run_ring(args.n, message, args.batch, args.capacity, args.size)),
+    )
+    print('{} messages of {} bytes'.format(args.n, args.size))
+    for name, transport in transports:
+        print('{:<14} {:>12.0f} messages/s'.format(name, transport()))
+
+
+if __name__ == '__main__':
+    main()
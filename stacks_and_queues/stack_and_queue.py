@@ -152,4 +152,178 @@ class QueueLinkedList(object):
         if self.head is None:
             self.tail = None 
         return element.item 
-    
\ No newline at end of file
+        
+class RingDeque(object):
+    """Growable ring-buffer implementation of a double-ended queue.
+    
+    Items live in a circular array whose capacity is a power of two, so positions wrap 
+    with a bit mask. The array doubles when it is full and halves when it is a quarter 
+    full, which gives amortized O(1) push/pop at both ends, and O(1) indexed access.
+    """
+    
+    MIN_CAPACITY = 8
+    
+    def __init__(self, iterable=()):
+        """Creates a deque.
+        
+        Args:
+            iterable: Initial items, from the front to the back (optional).
+        """
+        self.array = [None] * self.MIN_CAPACITY
+        self.mask = self.MIN_CAPACITY - 1
+        self.head = 0 
+        self.size = 0 
+        self.extend(iterable)
+        
+    def __len__(self):
+        return self.size
+    
+    def empty(self):
+        """Tests whether the deque is empty."""
+        return self.size == 0
+    
+    def _index(self, i):
+        """Returns the array position of the i-th item (negative i counts from the back)."""
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError('deque index out of range')
+        return (self.head + i) & self.mask
+    
+    def __getitem__(self, i):
+        return self.array[self._index(i)]
+    
+    def __setitem__(self, i, item):
+        self.array[self._index(i)] = item
+        
+    def __iter__(self):
+        array, mask, head = self.array, self.mask, self.head
+        for i in range(self.size):
+            yield array[(head + i) & mask]
+            
+    def _items(self, start, stop):
+        """Returns the items start to stop - 1 (from the front) as a list of at most two slice copies."""
+        first = (self.head + start) & self.mask
+        last = first + stop - start
+        if last <= len(self.array):
+            return self.array[first:last]
+        return self.array[first:] + self.array[:last - len(self.array)]
+    
+    def _resize(self, capacity):
+        """Moves the items to the front of a new array of the given capacity."""
+        self.array = self._items(0, self.size) + [None] * (capacity - self.size)
+        self.mask = capacity - 1
+        self.head = 0 
+        
+    def _shrink(self):
+        """Halves the capacity while the deque is at most a quarter full."""
+        capacity = len(self.array)
+        while capacity > self.MIN_CAPACITY and self.size <= capacity >> 2:
+            capacity >>= 1
+        if capacity < len(self.array):
+            self._resize(capacity)
+        
+    def append(self, item):
+        """Pushes an item to the back of the deque."""
+        size = self.size
+        if size == len(self.array):
+            self._resize(size << 1)
+        self.array[(self.head + size) & self.mask] = item
+        self.size = size + 1
+        
+    def appendleft(self, item):
+        """Pushes an item to the front of the deque."""
+        if self.size == len(self.array):
+            self._resize(len(self.array) << 1)
+        self.head = (self.head - 1) & self.mask
+        self.array[self.head] = item
+        self.size += 1 
+        
+    def pop(self):
+        """Pops an item from the back of the deque.
+        
+        Returns:
+            The popped item.
+        Raises:
+            UnderflowError if the deque is empty.
+        """
+        size = self.size - 1
+        if size < 0:
+            raise UnderflowError
+        array = self.array
+        position = (self.head + size) & self.mask
+        item = array[position]
+        array[position] = None
+        self.size = size
+        if size <= len(array) >> 2:
+            self._shrink()
+        return item
+    
+    def popleft(self):
+        """Pops an item from the front of the deque.
+        
+        Returns:
+            The popped item.
+        Raises:
+            UnderflowError if the deque is empty.
+        """
+        size = self.size - 1
+        if size < 0:
+            raise UnderflowError
+        array = self.array
+        head = self.head
+        item = array[head]
+        array[head] = None
+        self.head = (head + 1) & self.mask
+        self.size = size
+        if size <= len(array) >> 2:
+            self._shrink()
+        return item
+    
+    enqueue = append
+    dequeue = popleft
+    
+    def extend(self, iterable):
+        """Pushes items to the back of the deque, copying them in at most two slices.
+        
+        Args:
+            iterable: Items to be pushed.
+        """
+        items = iterable if isinstance(iterable, list) else list(iterable)
+        n = len(items)
+        if n == 0:
+            return
+        capacity = len(self.array)
+        if self.size + n > capacity:
+            while self.size + n > capacity:
+                capacity <<= 1
+            self._resize(capacity)
+        start = (self.head + self.size) & self.mask
+        k = min(n, capacity - start)
+        self.array[start:start + k] = items[:k]
+        if k < n:
+            self.array[:n - k] = items[k:]
+        self.size += n
+        
+    def drain(self, n=None):
+        """Pops up to n items from the front of the deque, copying them out in at most two slices.
+        
+        Args:
+            n: Maximum number of items to pop (optional, all items by default).
+        Returns:
+            List of the popped items, from the front to the back.
+        """
+        if n is None or n > self.size:
+            n = self.size
+        if n <= 0:
+            return []
+        items = self._items(0, n)
+        capacity = len(self.array)
+        k = min(n, capacity - self.head)
+        self.array[self.head:self.head + k] = [None] * k
+        if k < n:
+            self.array[:n - k] = [None] * (n - k)
+        self.head = (self.head + n) & self.mask
+        self.size -= n
+        self._shrink()
+        return items
@@ -0,0 +1,105 @@
+"""
+
+Benchmark of the queue implementations
+
+Workloads (reported in million operations per second):
+
+- fifo: n enqueues followed by n dequeues
+
+- steady: a queue holding n / 10 keys, with one enqueue and one dequeue per step
+
+- batch: n keys moved in batches of 64 (RingDeque.extend/drain; plain enqueue/dequeue
+  loops for the other queues)
+
+Memory is the size (tracemalloc) of a queue holding n small integers, not counting the
+integers themselves.
+
+Usage: python stack_and_queue_benchmark.py [--n N]
+
+"""
+
+import argparse
+import collections
+import time
+import tracemalloc
+
+import stack_and_queue
+
+
+class CollectionsDeque(collections.deque):
+    """collections.deque with the queue interface, as a reference."""
+    enqueue = collections.deque.append
+    dequeue = collections.deque.popleft
+
+
+QUEUES = (
+    ('QueueLinkedList', stack_and_queue.QueueLinkedList),
+    ('RingDeque', stack_and_queue.RingDeque),
+    ('collections', CollectionsDeque),
+)
+
+
+def fifo(queue_class, keys):
+    aqueue = queue_class()
+    for key in keys:
+        aqueue.enqueue(key)
+    for _ in keys:
+        aqueue.dequeue()
+    return 2 * len(keys)
+
+
+def steady(queue_class, keys):
+    aqueue = queue_class()
+    for key in keys[:len(keys) // 10]:
+        aqueue.enqueue(key)
+    for key in keys:
+        aqueue.enqueue(key)
+        aqueue.dequeue()
+    return 2 * len(keys) + len(keys) // 10
+
+
+def batch(queue_class, keys, size=64):
+    aqueue = queue_class()
+    if hasattr(aqueue, 'drain'):
+        for i in range(0, len(keys), size):
+            aqueue.extend(keys[i:i + size])
+            aqueue.drain(size)
+    else:
+        for i in range(0, len(keys), size):
+            for key in keys[i:i + size]:
+                aqueue.enqueue(key)
+            for _ in range(len(keys[i:i + size])):
+                aqueue.dequeue()
+    return 2 * len(keys)
+
+
+def memory(queue_class, keys):
+    tracemalloc.start()
+    aqueue = queue_class()
+    for key in keys:
+        aqueue.enqueue(key)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=1000000)
+    args = parser.parse_args()
+    keys = list(range(args.n))
+    workloads = (('fifo', fifo), ('steady', steady), ('batch', batch))
+    print('{:<16}'.format('n = {}'.format(args.n)) + ''.join('{:>10}'.format(name) for name, _ in workloads)
+          + '{:>10}'.format('MiB'))
+    for name, queue_class in QUEUES:
+        row = '{:<16}'.format(name)
+        for _, workload in workloads:
+            start = time.perf_counter()
+            operations = workload(queue_class, keys)
+            row += '{:>10.2f}'.format(operations / (time.perf_counter() - start) / 1e6)
+        row += '{:>10.1f}'.format(memory(queue_class, keys) / 2 ** 20)
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+import asyncio
+import collections
+import platform
+import random
+import threading
+import time
+import unittest
+from unittest import mock
+import bounded_queue
+import shared_ring
+import stack_and_queue
+
+
+class SimpleCasesQueues(unittest.TestCase):
+
+    def test_queues(self):
+        """Tests the FIFO order and underflow of QueueArray, QueueLinkedList and RingDeque"""
+        for aqueue in (stack_and_queue.QueueArray(8), stack_and_queue.QueueLinkedList(), stack_and_queue.RingDeque()):
+            self.assertTrue(aqueue.empty())
+            self.assertRaises(stack_and_queue.UnderflowError, aqueue.dequeue)
+            for key in range(5):
+                aqueue.enqueue(key)
+            self.assertEqual([aqueue.dequeue() for _ in range(3)], [0, 1, 2])
+            for key in range(5, 9):
+                aqueue.enqueue(key)
+            self.assertEqual([aqueue.dequeue() for _ in range(6)], [3, 4, 5, 6, 7, 8])
+            self.assertTrue(aqueue.empty())
+
+    def test_ring_deque(self):
+        """Tests RingDeque against collections.deque on random operations at both ends"""
+        rng = random.Random(1)
+        adeque = stack_and_queue.RingDeque()
+        expected = collections.deque()
+        for step in range(20000):
+            op = rng.randrange(7)
+            if op == 0:
+                adeque.append(step)
+                expected.append(step)
+            elif op == 1:
+                adeque.appendleft(step)
+                expected.appendleft(step)
+            elif op == 2 and expected:
+                self.assertEqual(adeque.pop(), expected.pop())
+            elif op == 3 and expected:
+                self.assertEqual(adeque.popleft(), expected.popleft())
+            elif op == 4:
+                items = list(range(step, step + rng.randrange(40)))
+                adeque.extend(items)
+                expected.extend(items)
+            elif op == 5:
+                n = rng.randrange(50)
+                self.assertEqual(adeque.drain(n), [expected.popleft() for _ in range(min(n, len(expected)))])
+            elif op == 6 and expected:
+                i = rng.randrange(-len(expected), len(expected))
+                self.assertEqual(adeque[i], expected[i])
+            self.assertEqual(len(adeque), len(expected))
+            self.assertLessEqual(len(adeque.array), max(stack_and_queue.RingDeque.MIN_CAPACITY, 4 * len(adeque)))
+        self.assertEqual(list(adeque), list(expected))
+        self.assertRaises(IndexError, lambda: adeque[len(expected)])
+        self.assertEqual(adeque.drain(), list(expected))
+        self.assertRaises(stack_and_queue.UnderflowError, adeque.pop)
+        self.assertEqual(len(adeque.array), stack_and_queue.RingDeque.MIN_CAPACITY)
+
+    def test_bounded_queue(self):
+        """Tests BoundedQueue with concurrent producers and batched consumers"""
+        aqueue = bounded_queue.BoundedQueue(4)
+        self.assertRaises(stack_and_queue.UnderflowError, aqueue.get, 0.01)
+        self.assertEqual(aqueue.get_batch(8, 0.01), [])
+        self.assertRaises(ValueError, aqueue.get_batch, 0)
+        for key in range(4):
+            aqueue.put_nowait(key)
+        self.assertTrue(aqueue.full())
+        self.assertRaises(stack_and_queue.OverflowError, aqueue.put, 4, 0.01)
+        self.assertEqual(aqueue.get_batch(3), [0, 1, 2])
+        self.assertEqual(aqueue.get_nowait(), 3)
+
+        n = 2000
+        producers = [threading.Thread(target=lambda p=p: [aqueue.put((p, i)) for i in range(n)]) for p in range(3)]
+        received = []
+        sizes = []
+
+        def consume():
+            deadline = time.monotonic() + 30
+            while len(received) < 3 * n and time.monotonic() < deadline:
+                received.extend(aqueue.get_batch(16, 1))
+                sizes.append(len(aqueue))
+
+        consumer = threading.Thread(target=consume)
+        for thread in producers + [consumer]:
+            thread.daemon = True  # a failure must not leave the test run waiting for them
+            thread.start()
+        for thread in producers + [consumer]:
+            thread.join(30)
+            self.assertFalse(thread.is_alive())
+        self.assertLessEqual(max(sizes), aqueue.maxsize)
+        for p in range(3):
+            self.assertEqual([i for q, i in received if q == p], list(range(n)))
+        self.assertTrue(aqueue.empty())
+
+    def test_async_bounded_queue(self):
+        """Tests AsyncBoundedQueue with a producer task running ahead of a consumer task"""
+
+        async def run():
+            aqueue = bounded_queue.AsyncBoundedQueue(3)
+            with self.assertRaises(stack_and_queue.UnderflowError):
+                await aqueue.get(0.01)
+            self.assertEqual(await aqueue.get_batch(8, 0), [])
+            with self.assertRaises(ValueError):
+                await aqueue.get_batch(-1)
+            sizes = []
+
+            async def produce():
+                for key in range(100):
+                    await aqueue.put(key)
+                    sizes.append(len(aqueue))
+
+            producer = asyncio.ensure_future(produce())
+            received = []
+            while len(received) < 100:
+                received.extend(await aqueue.get_batch(2))
+                await asyncio.sleep(0)
+            await producer
+            self.assertEqual(received, list(range(100)))
+            self.assertLessEqual(max(sizes), 3)
+            for key in range(3):
+                await aqueue.put(key, 0)
+            with self.assertRaises(stack_and_queue.OverflowError):
+                await aqueue.put(3, 0.01)
+            self.assertEqual(await aqueue.get(), 0)
+
+        asyncio.run(run())
+
+    @unittest.skipUnless(platform.machine().lower() in shared_ring.X86_64, 'requires x86-64')
+    def test_shared_ring_buffer(self):
+        """Tests SharedRingBuffer frames and records through a producer and an attached consumer"""
+        rng = random.Random(2)
+        for record_size in (None, 8, 12):
+            producer = shared_ring.SharedRingBuffer.create(200, record_size)
+            consumer = shared_ring.SharedRingBuffer.attach(producer.name)
+            self.assertRaises(stack_and_queue.UnderflowError, consumer.dequeue)
+            expected = collections.deque()
+            for step in range(5000):
+                if rng.random() < 0.55:
+                    items = [bytes([step % 256]) * (record_size or rng.randrange(40)) for _ in range(rng.randrange(1, 4))]
+                    count = producer.enqueue_many(items)
+                    expected.extend(items[:count])
+                elif rng.random() < 0.5:
+                    for item in consumer.dequeue_many(rng.randrange(1, 5)):
+                        self.assertEqual(item, expected.popleft())
+                else:
+                    views = consumer.peek_many(2)
+                    self.assertEqual([bytes(view) for view in views], list(expected)[:len(views)])
+                    del views
+                    consumer.release()
+                    for _ in range(min(2, len(expected))):
+                        expected.popleft()
+            self.assertEqual(consumer.dequeue_many(), list(expected))
+            self.assertTrue(producer.empty())
+            self.assertEqual(producer.used_bytes(), 0)
+            producer.enqueue(b'x' * (record_size or 5))
+            self.assertEqual(consumer.used_bytes(), record_size or 16)
+            consumer.dequeue()
+            item = b'x' * (record_size or 8)
+            while producer.enqueue_many([item] * 4):
+                pass
+            self.assertRaises(stack_and_queue.OverflowError, producer.enqueue, item)
+            self.assertRaises(ValueError, producer.enqueue, bytes(record_size + 1 if record_size else 200))
+            consumer.close()
+            producer.close()
+
+        ring = shared_ring.SharedRingBuffer.create(256)  # one instance as producer and consumer
+        ring._put(b'a')  # written, not published yet (as in the middle of enqueue_many)
+        self.assertEqual(ring.peek_many(), [])
+        ring.enqueue_many([b'b'])
+        self.assertEqual(ring.dequeue_many(), [b'a', b'b'])
+        self.assertRaises(ValueError, ring.enqueue_many, [b'a', b'b', b'x' * 200])  # inserts nothing
+        self.assertEqual(ring.dequeue_many(), [])
+        ring.enqueue(b'c')
+        self.assertEqual(ring.dequeue_many(), [b'c'])
+        ring.close()
+
+    def test_shared_ring_buffer_platform(self):
+        """Tests that SharedRingBuffer refuses weakly ordered CPUs"""
+        with mock.patch('platform.machine', return_value='aarch64'):
+            self.assertRaises(RuntimeError, shared_ring.SharedRingBuffer.create, 256)
+            self.assertRaises(RuntimeError, shared_ring.SharedRingBuffer.attach, 'ring')
+
+
+if __name__ == '__main__':
+    unittest.main()
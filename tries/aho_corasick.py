@@ -0,0 +1,76 @@
+from collections import deque
+
+
+class AhoCorasick(object):
+    """Aho-Corasick automaton finding all words of a trie.Trie in a text in one linear pass.
+
+    Compiling copies the trie into state tables indexed by state number (0 is the root):
+
+    - children: dict from character to the child state
+
+    - fail: the state of the longest proper suffix of the state's string that is also a
+      prefix in the trie (the root for the root and its children)
+
+    - output: the nearest state along the fail chain that completes a word; None if there is none
+
+    - words: the word completed by the state; None if there is none
+
+    The automaton does not refer to the trie's nodes, so later changes to the trie do not
+    affect it (compile again to pick them up).
+    """
+
+    def __init__(self, atrie):
+        """Compiles the automaton from the nodes of atrie.
+
+        Args:
+            atrie: trie.Trie holding the words to search for.
+        """
+        self.children = [{}]
+        self.fail = [0]
+        self.output = [None]
+        self.words = [None]
+        if atrie.root is None:
+            return
+        children, fail, output, words = self.children, self.fail, self.output, self.words
+        frontier = deque([(atrie.root, 0)])
+        while frontier:  # breadth-first, so the fail targets of u's children are final
+            node, u = frontier.popleft()
+            for c, child in node.children.items():
+                v = len(children)
+                children[u][c] = v
+                children.append({})
+                words.append(child.text if child.is_word else None)
+                state = fail[u]
+                while u and state and c not in children[state]:
+                    state = fail[state]
+                target = children[state].get(c, 0) if u else 0
+                fail.append(target)
+                output.append(target if words[target] is not None else output[target])
+                frontier.append((child, v))
+
+    def scan(self, text):
+        """Finds all occurrences of the words in text, including overlapping ones.
+
+        Args:
+            text: A string or an iterable of string chunks (e.g. blocks read from a stream);
+                matches spanning chunk boundaries are found as well.
+        Yields:
+            Pairs (position, word), where position is the index of the first character of
+            the occurrence in the concatenated text, in the order in which occurrences end.
+        """
+        children, fail, output, words = self.children, self.fail, self.output, self.words
+        if isinstance(text, str):
+            text = (text,)
+        state = 0
+        position = 0
+        for chunk in text:
+            for c in chunk:
+                while state and c not in children[state]:
+                    state = fail[state]
+                state = children[state].get(c, 0)
+                match = state if words[state] is not None else output[state]
+                while match is not None:
+                    word = words[match]
+                    yield position - len(word) + 1, word
+                    match = output[match]
+                position += 1
@@ -0,0 +1,52 @@
+import heapq
+
+
+def top_k(node, prefix, k, best, score, children):
+    """Returns the k words with the highest scores (ties broken alphabetically) in the subtrie
+    rooted at node, found by a best-first search that expands subtries in the order of the
+    best score they hold, so only O(k) nodes along the way are expanded (times the branching).
+
+    Shared by Trie, RadixTrie and FrozenTrie, which describe their nodes through accessors.
+
+    Args:
+        node: Root of the subtrie.
+        prefix: The string spelled by the path from the root of the trie to node.
+        k: Number of words to return.
+        best: best(u) is the largest score of a word in the subtrie rooted at u; None if there is no word.
+        score: score(u) is the score of the word ending at u; None if no word ends at u.
+        children: children(u) yields (label, child) pairs, label being the string on the edge to child.
+    Returns:
+        List of at most k words, from the highest score down.
+    """
+    result = []
+    if k <= 0 or best(node) is None:
+        return result
+    # entries: (-score, word, 0) for words, (-best, prefix, 1, node) for subtries; a subtrie
+    # with prefix p only holds words w >= p with scores <= best, so entries pop in result order
+    frontier = [(-best(node), prefix, 1, node)]
+    while frontier:
+        entry = heapq.heappop(frontier)
+        if entry[2] == 0:
+            result.append(entry[1])
+            if len(result) == k:
+                break
+            continue
+        prefix, u = entry[1], entry[3]
+        u_score = score(u)
+        if u_score is not None:
+            heapq.heappush(frontier, (-u_score, prefix, 0))
+        for label, v in children(u):
+            v_best = best(v)
+            if v_best is not None:
+                heapq.heappush(frontier, (-v_best, prefix + label, 1, v))
+    return result
+
+
+def node_best(node):
+    """The best accessor of top_k() for TrieNode and RadixNode."""
+    return node.best
+
+
+def node_score(node):
+    """The score accessor of top_k() for TrieNode and RadixNode."""
+    return node.score if node.is_word else None
@@ -0,0 +1,206 @@
+"""
+
+Static (read-only) trie compiled into flat arrays and loaded through mmap
+
+freeze() lays the nodes of a trie.Trie out in level order (breadth-first, children
+sorted by character), so the children of every node occupy a contiguous range of
+indices. The file holds one array per node attribute:
+
+    header    magic b'FTRI', version, byte order, number of nodes n, number of words
+    score     float64[n]   score of the word ending at the node (NaN if none)
+    best      float64[n]   largest score in the subtrie (NaN if the subtrie has no word)
+    first     uint32[n+1]  index of the first child; children of i are first[i]:first[i+1]
+    label     uint32[n]    code point of the character on the edge into the node
+    is_word   uint8[n]
+
+FrozenTrie maps the file and reads the arrays through memoryviews, so loading is
+O(1), no per-node Python objects are created and the pages are shared by all
+processes mapping the same file. Scores are stored as floats.
+
+"""
+
+import math
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+from completions import top_k
+
+MAGIC = b'FTRI'
+VERSION = 1
+HEADER = struct.Struct('<4sBcxxQQ')  # magic, version, byte order, padding, nodes, words
+BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+NAN = float('nan')
+
+
+def freeze(atrie, path):
+    """Compiles a trie.Trie into a file that FrozenTrie can load.
+
+    Args:
+        atrie: The trie to be compiled.
+        path: Path of the file to be written.
+    """
+    score = array('d')
+    best = array('d')
+    first = array('I')
+    label = array('I')
+    is_word = array('B')
+    root = atrie.root
+    queue = deque([(root, 0)]) if root is not None else deque()
+    next_index = 1
+    while queue:
+        node, c = queue.popleft()
+        score.append(node.score if node.is_word else NAN)
+        best.append(NAN if node.best is None else node.best)
+        label.append(c)
+        is_word.append(1 if node.is_word else 0)
+        first.append(next_index)
+        for ch in sorted(node.children):
+            queue.append((node.children[ch], ord(ch)))
+            next_index += 1
+    first.append(next_index)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER, len(label), int(sum(is_word))))
+        for section in (score, best, first, label, is_word):
+            section.tofile(f)
+
+
+class FrozenTrie(object):
+    """A read-only trie backed by a memory-mapped file written by freeze().
+
+    Nodes are identified by their indices (the root is 0) instead of node objects.
+    """
+
+    def __init__(self, path):
+        """Maps the file at path.
+
+        Raises:
+            ValueError if the file was not written by freeze() on a machine of the same byte order,
+            or is truncated.
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = buf = memoryview(self._mmap)
+        sections = []
+        try:
+            if len(buf) < HEADER.size:
+                raise ValueError('Frozen trie file is truncated.')
+            magic, version, byte_order, n, words = HEADER.unpack_from(buf)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError('Not a frozen trie file (or unsupported version).')
+            if byte_order != BYTE_ORDER:
+                raise ValueError('Frozen trie was written with a different byte order.')
+            layout = (('d', 8, n), ('d', 8, n), ('I', 4, n + 1), ('I', 4, n), ('B', 1, n))
+            if len(buf) < HEADER.size + sum(itemsize * count for _, itemsize, count in layout):
+                raise ValueError('Frozen trie file is truncated.')
+            offset = HEADER.size
+            for typecode, itemsize, count in layout:
+                sections.append(buf[offset:offset + itemsize * count].cast(typecode))
+                offset += itemsize * count
+        except BaseException:
+            for section in sections:
+                section.release()
+            buf.release()
+            self._mmap.close()
+            raise
+        self.n = n
+        self.words = words
+        self._score, self._best, self._first, self._label, self._is_word = sections
+
+    def close(self):
+        """Releases the memory map."""
+        for section in (self._score, self._best, self._first, self._label, self._is_word, self._buf):
+            section.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.words
+
+    def __contains__(self, word):
+        return self.find(word) is not None
+
+    def _child(self, node, c):
+        """Returns the index of the child of node along character c; None if there is none."""
+        lo, hi = self._first[node], self._first[node + 1]
+        i = bisect_left(self._label, ord(c), lo, hi)
+        if i < hi and self._label[i] == ord(c):
+            return i
+        return None
+
+    def find_stem(self, word):
+        """Returns the index of the node spelling word; None if no word starts with word."""
+        if self.n == 0:
+            return None
+        node = 0
+        for c in word:
+            node = self._child(node, c)
+            if node is None:
+                return None
+        return node
+
+    def find(self, word):
+        """Returns the index of the node of word; None if word is not in the trie."""
+        node = self.find_stem(word)
+        if node is None or not self._is_word[node]:
+            return None
+        return node
+
+    def has_prefix(self, prefix):
+        """Tests whether some word starts with prefix."""
+        node = self.find_stem(prefix)
+        return node is not None and not math.isnan(self._best[node])
+
+    def score(self, word):
+        """Returns the score of word; raises KeyError if word is not in the trie."""
+        node = self.find(word)
+        if node is None:
+            raise KeyError(word)
+        return self._score[node]
+
+    def iter_words(self, prefix=''):
+        """Yields the words starting with prefix in lexicographic order."""
+        node = self.find_stem(prefix)
+        if node is None:
+            return
+        first, label, is_word = self._first, self._label, self._is_word
+        stack = [(node, prefix)]
+        while stack:
+            u, text = stack.pop()
+            if is_word[u]:
+                yield text
+            for v in range(first[u + 1] - 1, first[u] - 1, -1):
+                stack.append((v, text + chr(label[v])))
+
+    def autocomplete(self, word, k=None):
+        """Returns the words starting with word from shortest to longest, or, if k is given, the
+        k completions with the highest scores (ties broken alphabetically), as trie.Trie does."""
+        node = self.find_stem(word)
+        first, label, is_word = self._first, self._label, self._is_word
+        if k is None:
+            if node is None:
+                return None
+            result = []
+            frontier = deque([(node, word)])
+            while frontier:
+                u, text = frontier.popleft()
+                if is_word[u]:
+                    result.append(text)
+                for v in range(first[u], first[u + 1]):
+                    frontier.append((v, text + chr(label[v])))
+            return result
+        if node is None:
+            return []
+        score, best = self._score, self._best
+        return top_k(node, word, k,
+                     lambda u: None if math.isnan(best[u]) else best[u],
+                     lambda u: score[u] if is_word[u] else None,
+                     lambda u: ((chr(label[v]), v) for v in range(first[u], first[u + 1])))
@@ -0,0 +1,170 @@
+from completions import node_best, node_score, top_k
+from trie import TrieNode
+
+
+class RadixNode(object):
+    """A node in the radix trie. Chains of single-child nodes of a trie are merged into one
+    edge, so the edge leading to a node is labelled with a string instead of a character.
+
+    Attributes:
+        parent: The node's parent.
+        label: Label of the edge from the parent (empty for the root).
+        children: Children nodes by the first character of their labels.
+        is_word: True if the path to this node spells a complete word, False otherwise.
+        text: The word (if is_word is True).
+        score: Score of the word (if is_word is True).
+        best: The largest score of a word in the subtrie rooted at this node; None if there is no word.
+    """
+
+    __slots__ = ('parent', 'label', 'children', 'is_word', 'text', 'score', 'best')
+
+    def __init__(self, parent, label, is_word=False):
+        """Creates a node."""
+        self.parent = parent
+        self.label = label
+        self.children = {}
+        self.is_word = is_word
+        self.text = None
+        self.score = None
+        self.best = None
+
+    update_best = TrieNode.update_best
+    raise_best = TrieNode.raise_best
+
+    def find(self, word, stem=False):
+        """Finds and returns the node with word word from the subtrie rooted at this node. Stem
+        search finds and returns the node whose subtrie holds exactly the words starting with word
+        (word may end inside the label of the edge leading to that node).
+
+        Args:
+            word: The word/stem of the node we want to find.
+            stem: Specifies if searching a word (False) or a stem (True).
+
+        Returns:
+            The node with word word, or the node of the corresponding stem (when stem is True).
+        """
+        current = self
+        i = 0
+        n = len(word)
+        while i < n:
+            child = current.children.get(word[i])
+            if child is None:
+                return None
+            label = child.label
+            if word.startswith(label, i):
+                i += len(label)
+            elif stem and label.startswith(word[i:]):
+                return child
+            else:
+                return None
+            current = child
+        if stem or current.is_word:
+            return current
+        return None
+
+    def iter_words(self):
+        """Yields the words in the subtrie rooted at this node in lexicographic order."""
+        stack = [self]
+        while stack:
+            u = stack.pop()
+            if u.is_word:
+                yield u.text
+            stack.extend(u.children[c] for c in sorted(u.children, reverse=True))
+
+
+class RadixTrie(object):
+    """An implementation of a radix (compressed, Patricia) trie with the API of trie.Trie."""
+
+    def __init__(self):
+        """Creates an empty trie."""
+        self.root = None
+
+    def find(self, word):
+        """Finds and returns the node with word word from this trie; None if there is no such word."""
+        return self.root and self.root.find(word)
+
+    def find_stem(self, word):
+        """Finds and returns the node of stem corresponding to word from this trie; None if no word
+        starts with word."""
+        return self.root and self.root.find(word, True)
+
+    def insert(self, word, score=None):
+        """Inserts word into this trie.
+
+        Args:
+            word: The word to be inserted.
+            score: Score of the word used to rank autocomplete results; replaces the score of a
+                word that is already in the trie (optional, new words default to 0).
+        """
+        assert isinstance(word, str)
+        assert len(word) > 0
+        if self.root is None:
+            self.root = RadixNode(None, '')
+        current = self.root
+        i = 0
+        n = len(word)
+        while i < n:
+            c = word[i]
+            child = current.children.get(c)
+            if child is None:
+                child = RadixNode(current, word[i:])
+                current.children[c] = child
+                current = child
+                break
+            label = child.label
+            j = 1
+            m = min(len(label), n - i)
+            while j < m and label[j] == word[i + j]:
+                j += 1
+            if j < len(label):  # split the edge after its first j characters
+                middle = RadixNode(current, label[:j])
+                middle.best = child.best
+                current.children[c] = middle
+                child.label = label[j:]
+                child.parent = middle
+                middle.children[child.label[0]] = child
+                child = middle
+            current = child
+            i += j
+        node = current
+        if not node.is_word:
+            node.is_word = True
+            node.text = word
+        old_score = node.score
+        if score is None:
+            score = 0 if old_score is None else old_score
+        node.score = score
+        if old_score is None or old_score < score:
+            node.raise_best(score)
+        elif score < old_score:
+            node.update_best()
+
+    # aradix.autocomplete('') will return all words in a trie
+    def autocomplete(self, word, k=None):
+        """Returns the words starting with word from shortest to longest, or, if k is given, the
+        k completions with the highest scores (ties broken alphabetically), as trie.Trie does.
+
+        Args:
+            word: The word to be completed.
+            k: Number of best completions to return (optional).
+        """
+        assert isinstance(word, str)
+        node = self.find_stem(word)
+        if k is None:
+            return node and sorted(node.iter_words(), key=len)
+        if node is None:
+            return []
+        return top_k(node, _path(node), k, node_best, node_score, _children)
+
+
+def _children(node):
+    return ((v.label, v) for v in node.children.values())
+
+
+def _path(node):
+    """Returns the string spelled by the edges from the root to node."""
+    labels = []
+    while node is not None:
+        labels.append(node.label)
+        node = node.parent
+    return ''.join(reversed(labels))
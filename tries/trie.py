@@ -1,3 +1,8 @@
+from collections import deque
+
+import frozen_trie
+from completions import node_best, node_score, top_k
+
 
 class TrieNode(object):
     """A node in the Trie.""" 
@@ -9,10 +14,40 @@ class TrieNode(object):
             parent: The node's parent.
             is_word: True if it is a complete word, False otherwise. 
             children: Pointers to children nodes. 
+            score: Score of the word (if is_word is True). 
+            best: The largest score of a word in the subtrie rooted at this node; None if there is no word. 
+            count: Number of words in the subtrie rooted at this node. 
+            value: Payload associated with the word (if is_word is True). 
         """
         self.parent = parent
         self.is_word = is_word 
         self.children = {}
+        self.score = None
+        self.best = None
+        self.count = 0
+        self.value = None
+
+    def update_best(self):
+        """Recomputes best on the path from this node to the root after the score of a word 
+        in the subtrie rooted at this node has changed."""
+        current = self
+        while current is not None:
+            best = current.score if current.is_word else None
+            for child in current.children.values():
+                if child.best is not None and (best is None or best < child.best):
+                    best = child.best
+            if best == current.best:
+                return
+            current.best = best
+            current = current.parent
+
+    def raise_best(self, score):
+        """Updates best on the path from this node to the root after a word with score was 
+        added to (or its score increased in) the subtrie rooted at this node."""
+        current = self
+        while current is not None and (current.best is None or current.best < score):
+            current.best = score
+            current = current.parent
         
     def find(self, word, stem=False):
         """Finds and returns the node with word word from the subtrie rooted at this 
@@ -44,6 +79,8 @@ class TrieNode(object):
         
         Args:
             node: The node to be inserted.
+        Returns:
+            The node holding the word of node (node itself unless the trie already had a node for it).
         """
         current = self
         level = 0
@@ -58,36 +95,52 @@ class TrieNode(object):
             level += 1
         c = node.text[level]
         if c in current.children:
-            if current.children[c].is_word:
-                return
-            else: 
-                current.children[c].is_word = True 
-                current.children[c].text = node.text 
+            existing = current.children[c]
+            if not existing.is_word:
+                existing.is_word = True 
+                existing.text = node.text 
+            return existing
         else: 
             current.children[c] = node 
             node.parent = current 
+            return node
                 
     def level_order_traversal(self):
         """Returns the list of words from shortest to longest in the subtrie rooted at this node."""
-        level_order = []
-        if self.is_word: level_order.append(self.text)
-        frontier = [self]
-        #level = { self: 0 }
-        i = 1
-        while frontier: 
-            new = [] 
-            for u in frontier: 
-                for c in u.children:
-                    v = u.children[c]
-                    #if v not in level: # this is always True
-                    #level[v] = i
-                    if v.is_word:
-                        level_order.append(v.text)
-                    new.append(v)
-            frontier = new 
-            i += 1 
-        return level_order 
+        return list(self.iter_words('bfs'))
+
+    def iter_words(self, order='bfs'):
+        """Yields the words in the subtrie rooted at this node as they are found.
         
+        Args:
+            order: 'bfs' (from shortest to longest, as level_order_traversal), 'dfs' (depth-first, 
+                children in insertion order) or 'lex' (lexicographic order).
+        """
+        if order == 'bfs':
+            frontier = deque([self])
+            while frontier:
+                u = frontier.popleft()
+                if u.is_word:
+                    yield u.text
+                frontier.extend(u.children.values())
+        elif order == 'dfs' or order == 'lex':
+            stack = [self]
+            while stack:
+                u = stack.pop()
+                if u.is_word:
+                    yield u.text
+                if order == 'lex':
+                    stack.extend(u.children[c] for c in sorted(u.children, reverse=True))
+                else:
+                    stack.extend(reversed(list(u.children.values())))
+        else:
+            raise ValueError('Unknown traversal order: {}'.format(order))
+
+
+def _children(node):
+    return node.children.items()
+
+
 class Trie(object):
     """An implementation of a trie.""" 
     
@@ -117,11 +170,67 @@ class Trie(object):
         """
         return self.root and self.root.find(word, True)
     
-    def insert(self, word):
+    @classmethod
+    def build_from_sorted(cls, words, scores=None, values=None):
+        """Builds a trie from words in sorted order. The counts and best scores are computed in 
+        one pass over the nodes after they are all created (children before parents), instead of 
+        being updated along the whole path of every inserted word as insert() does.
+        
+        Args:
+            words: Iterable of non-empty words in sorted order (duplicates are ignored).
+            scores: Iterable of the corresponding scores (optional, default 0).
+            values: Iterable of the corresponding payloads (optional).
+        Returns:
+            The trie.
+        Raises:
+            ValueError if words are not sorted.
+        """
+        atrie = cls()
+        root = atrie.root = TrieNode(None, False)
+        scores = iter(scores) if scores is not None else None
+        values = iter(values) if values is not None else None
+        nodes = []  # nodes in creation order: every node comes after its parent
+        previous = ''
+        for word in words:
+            score = next(scores) if scores is not None else 0
+            value = next(values) if values is not None else None
+            assert isinstance(word, str)
+            assert len(word) > 0 
+            if word <= previous:
+                if word == previous:
+                    continue
+                raise ValueError('Words are not sorted.')
+            current = root
+            for c in word:
+                child = current.children.get(c)
+                if child is None:
+                    child = TrieNode(current, False)
+                    current.children[c] = child
+                    nodes.append(child)
+                current = child
+            current.is_word = True
+            current.text = word
+            current.score = current.best = score
+            current.value = value
+            current.count = 1
+            previous = word
+        for node in reversed(nodes):  # children before parents
+            parent = node.parent
+            parent.count += node.count
+            best = node.best
+            if best is not None and (parent.best is None or parent.best < best):
+                parent.best = best
+        return atrie
+
+    def insert(self, word, score=None, value=None):
         """Inserts a node with word word into this trie. 
         
         Args:
             word: The word of the node to be inserted.
+            score: Score of the word used to rank autocomplete results; replaces the score of a 
+                word that is already in the trie (optional, new words default to 0).
+            value: Payload of the word; replaces the payload of a word that is already in the 
+                trie (optional).
         """
         assert isinstance(word, str)
         assert len(word) > 0 
@@ -129,17 +238,140 @@ class Trie(object):
         node.text = word
         if self.root is None:
             self.root = TrieNode(None, False)
-        self.root.insert(node)
-            
+        node = self.root.insert(node)
+        old_score = node.score
+        if old_score is None:  # a new word
+            node.value = value
+            current = node
+            while current is not None:
+                current.count += 1
+                current = current.parent
+        elif value is not None:
+            node.value = value
+        if score is None:
+            score = 0 if old_score is None else old_score
+        node.score = score
+        if old_score is None or old_score < score:
+            node.raise_best(score)
+        elif score < old_score:
+            node.update_best()
+
+    def delete(self, word):
+        """Removes word from this trie and prunes the branch of nodes left without words. 
+        
+        Args:
+            word: The word to be removed.
+        Returns:
+            The node of the removed word (with its text, score and value); None if word is not in the trie.
+        """
+        node = self.find(word)
+        if node is None:
+            return None
+        removed = TrieNode(None, True)
+        removed.text, removed.score, removed.value = node.text, node.score, node.value
+        node.is_word = False
+        node.score = None
+        node.value = None
+        current = node
+        while current is not None:
+            current.count -= 1
+            current = current.parent
+        depth = len(word)
+        while node.parent is not None and node.count == 0:
+            parent = node.parent
+            del parent.children[word[depth - 1]]
+            node.parent = None
+            node = parent
+            depth -= 1
+        node.update_best()
+        return removed
+
+    def count_prefix(self, prefix):
+        """Returns the number of words starting with prefix in O(len(prefix)) time."""
+        node = self.find_stem(prefix)
+        return node.count if node is not None else 0
+
+    def get(self, word, default=None):
+        """Returns the payload of word; default if word is not in the trie."""
+        node = self.find(word)
+        return default if node is None else node.value
+
+    def iter_words(self, prefix='', order='bfs'):
+        """Yields the words of this trie starting with prefix as they are found (see TrieNode.iter_words).
+        
+        Args:
+            prefix: Common prefix of the words.
+            order: 'bfs', 'dfs' or 'lex'.
+        """
+        assert isinstance(prefix, str)
+        node = self.find_stem(prefix)
+        if node is not None:
+            for word in node.iter_words(order):
+                yield word
+
+    def search_fuzzy(self, word, max_distance):
+        """Finds the words within Levenshtein (edit) distance max_distance of word.
+        
+        Walks the trie depth-first carrying one row of the edit-distance table per node (the 
+        distances between the node's prefix and every prefix of word); a subtrie is skipped as 
+        soon as the smallest value in its row exceeds max_distance, since extending the prefix 
+        can only increase the distance.
+        
+        Args:
+            word: The (possibly misspelled) word.
+            max_distance: The largest edit distance of a match.
+        Returns:
+            List of pairs (match, distance) sorted by distance, then alphabetically.
+        """
+        assert isinstance(word, str)
+        result = []
+        if self.root is None:
+            return result
+        n = len(word)
+        stack = [(self.root, list(range(n + 1)))]
+        while stack:
+            u, previous = stack.pop()
+            if u.is_word and previous[n] <= max_distance:
+                result.append((u.text, previous[n]))
+            for c, v in u.children.items():
+                row = [previous[0] + 1]
+                for i in range(1, n + 1):
+                    cost = previous[i - 1] if word[i - 1] == c else previous[i - 1] + 1
+                    if previous[i] + 1 < cost:
+                        cost = previous[i] + 1
+                    if row[i - 1] + 1 < cost:
+                        cost = row[i - 1] + 1
+                    row.append(cost)
+                if min(row) <= max_distance:
+                    stack.append((v, row))
+        result.sort(key=lambda match: (match[1], match[0]))
+        return result
+
+    def freeze(self, path):
+        """Compiles this trie into a file that frozen_trie.FrozenTrie loads through mmap.
+        
+        Args:
+            path: Path of the file to be written.
+        """
+        frozen_trie.freeze(self, path)
+
     # atrie.autocomplete('') will return all words in a trie 
-    def autocomplete(self, word):
+    def autocomplete(self, word, k=None):
         """Finds the node of stem matching word in this trie and returns the result of level order traversal 
         started at the node that was found.
+
+        If k is given, returns instead the k completions with the highest scores (ties broken 
+        alphabetically), found by a best-first search that expands nodes in the order of the best 
+        score in their subtrie, so only O(k) nodes along the way are expanded (times the branching).
         
         Args:
             word: The word to be completed. 
+            k: Number of best completions to return (optional).
         """
         assert isinstance(word, str)
         node = self.find_stem(word)
-        return node and node.level_order_traversal() 
-        
+        if k is None:
+            return node and node.level_order_traversal()
+        if node is None:
+            return []
+        return top_k(node, word, k, node_best, node_score, _children)
@@ -0,0 +1,118 @@
+"""
+
+Benchmark of Trie against RadixTrie
+
+Builds both tries from a word list (--words FILE, one word per line) or from --n
+synthetic words made of random syllables, then reports build time, memory allocated
+by the trie (tracemalloc, excluding the word strings themselves), lookup time and
+top-10 autocomplete latency. The Trie is also frozen into a file and reloaded as a
+FrozenTrie, for which load time and file size are reported instead. The build time
+of Trie.build_from_sorted on the same (sorted) words is reported last, to compare with
+the build time of Trie (every build starts after a full collection, with the garbage
+collector enabled).
+
+Usage: python trie_benchmark.py [--n N | --words FILE]
+
+"""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import frozen_trie
+import radix_trie
+import trie
+
+SYLLABLES = ['an', 'be', 'con', 'de', 'er', 'ing', 'in', 'ion', 'is', 'le', 'ly', 'ment', 'ness',
+             'on', 'pre', 're', 'ter', 'tion', 'un', 'ver', 'al', 'at', 'com', 'dis', 'en', 'es']
+
+
+def synthetic_words(n, rng):
+    """Returns n distinct words made of 2 to 6 syllables, with a skewed syllable distribution."""
+    weights = [1.0 / (rank + 1) for rank in range(len(SYLLABLES))]
+    words = set()
+    while len(words) < n:
+        words.add(''.join(rng.choices(SYLLABLES, weights, k=rng.randrange(2, 7))))
+    return sorted(words)
+
+
+def build(trie_class, words, scores):
+    atrie = trie_class()
+    for word, score in zip(words, scores):
+        atrie.insert(word, score)
+    return atrie
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=1000000)
+    parser.add_argument('--words', default=None)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    if args.words:
+        with open(args.words) as f:
+            words = sorted(set(line.strip() for line in f if line.strip()))
+    else:
+        words = synthetic_words(args.n, rng)
+    scores = [rng.random() for _ in words]
+    probes = rng.sample(words, min(len(words), 100000))
+    probes = probes + [word + 'x' for word in probes]
+    prefixes = [word[:3] for word in rng.sample(words, min(len(words), 1000))]
+    print('{} words, {} characters'.format(len(words), sum(map(len, words))))
+    print('{:<10} {:>9} {:>10} {:>11} {:>14}'.format('', 'build s', 'MiB', 'find us', 'top-10 ac us'))
+    gc.collect()
+    start = time.perf_counter()
+    atrie = trie.Trie.build_from_sorted(words, scores)
+    bulk_time = time.perf_counter() - start
+    del atrie
+    for trie_class in (trie.Trie, radix_trie.RadixTrie):
+        gc.collect()  # every build starts from the same heap
+        start = time.perf_counter()
+        atrie = build(trie_class, words, scores)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for word in probes:
+            atrie.find(word)
+        find_time = (time.perf_counter() - start) / len(probes)
+        start = time.perf_counter()
+        for prefix in prefixes:
+            atrie.autocomplete(prefix, 10)
+        autocomplete_time = (time.perf_counter() - start) / len(prefixes)
+        del atrie
+        tracemalloc.start()
+        atrie = build(trie_class, words, scores)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del atrie
+        print('{:<10} {:>9.2f} {:>10.1f} {:>11.2f} {:>14.1f}'.format(
+            trie_class.__name__, build_time, memory / 2 ** 20, find_time * 1e6, autocomplete_time * 1e6))
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        build(trie.Trie, words, scores).freeze(path)
+        start = time.perf_counter()
+        frozen = frozen_trie.FrozenTrie(path)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for word in probes:
+            frozen.find(word)
+        find_time = (time.perf_counter() - start) / len(probes)
+        start = time.perf_counter()
+        for prefix in prefixes:
+            frozen.autocomplete(prefix, 10)
+        autocomplete_time = (time.perf_counter() - start) / len(prefixes)
+        frozen.close()
+        print('{:<10} {:>9} {:>10} {:>11.2f} {:>14.1f}   load {:.6f} s, file {:.1f} MiB'.format(
+            'FrozenTrie', '-', '-', find_time * 1e6, autocomplete_time * 1e6,
+            load_time, os.path.getsize(path) / 2 ** 20))
+    finally:
+        os.remove(path)
+    print('{:<10} {:>9.2f}   (Trie.build_from_sorted)'.format('bulk', bulk_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+import os
+import random
+import tempfile
+import unittest
+import aho_corasick
+import frozen_trie
+import radix_trie
+import trie
+
+
+def random_words(rng, n, alphabet='abcd', max_length=6):
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randrange(1, max_length + 1))) for _ in range(n)]
+
+
+class SimpleCasesTrie(unittest.TestCase):
+
+    def test_find_and_autocomplete(self):
+        """Tests Trie find/find_stem and the level-order autocomplete"""
+        atrie = trie.Trie()
+        self.assertIsNone(atrie.find('a'))
+        for word in ('car', 'cart', 'cat', 'do', 'dog', 'c'):
+            atrie.insert(word)
+        self.assertEqual(atrie.find('cart').text, 'cart')
+        self.assertIsNone(atrie.find('ca'))
+        self.assertIsNotNone(atrie.find_stem('ca'))
+        self.assertEqual(sorted(atrie.autocomplete('ca')), ['car', 'cart', 'cat'])
+        self.assertEqual(atrie.autocomplete('c')[0], 'c')
+        self.assertIsNone(atrie.autocomplete('x'))
+
+    def test_top_k_autocomplete(self):
+        """Tests the ranked autocomplete against sorting all completions by score"""
+        rng = random.Random(0)
+        atrie = trie.Trie()
+        scores = {}
+        for word in random_words(rng, 2000):
+            scores[word] = rng.randrange(50)
+            atrie.insert(word, scores[word])
+        for word in rng.sample(sorted(scores), 200):  # lower and raise some scores again
+            scores[word] = rng.randrange(50)
+            atrie.insert(word, scores[word])
+        atrie.insert(word)  # keeps the score
+        for prefix in ('', 'a', 'ab', 'dca', 'bbbb', 'zz'):
+            completions = sorted((w for w in scores if w.startswith(prefix)), key=lambda w: (-scores[w], w))
+            for k in (0, 1, 5, 50, 10000):
+                self.assertEqual(atrie.autocomplete(prefix, k), completions[:k])
+
+    def test_iter_words(self):
+        """Tests the lazy BFS, DFS and lexicographic word generators"""
+        rng = random.Random(1)
+        words = set(random_words(rng, 500))
+        atrie = trie.Trie()
+        for word in words:
+            atrie.insert(word)
+        for prefix in ('', 'a', 'cd', 'zz'):
+            expected = sorted(w for w in words if w.startswith(prefix))
+            self.assertEqual(list(atrie.iter_words(prefix, 'lex')), expected)
+            self.assertEqual(sorted(atrie.iter_words(prefix, 'dfs')), expected)
+            bfs = list(atrie.iter_words(prefix))
+            self.assertEqual(sorted(bfs), expected)
+            self.assertEqual([len(w) for w in bfs], sorted(len(w) for w in bfs))
+        stream = atrie.iter_words('', 'lex')
+        self.assertEqual([next(stream) for _ in range(3)], sorted(words)[:3])
+        self.assertRaises(ValueError, list, atrie.iter_words('', 'random'))
+
+    def test_radix_trie(self):
+        """Tests RadixTrie against Trie (find, find_stem, both autocomplete modes)"""
+        rng = random.Random(2)
+        atrie = trie.Trie()
+        aradix = radix_trie.RadixTrie()
+        self.assertIsNone(aradix.find('a'))
+        words = random_words(rng, 1500, 'abc', 8) + ['abcabcabcabc', 'abcabc']
+        for word in words:
+            score = rng.randrange(20)
+            atrie.insert(word, score)
+            aradix.insert(word, score)
+        for word in random_words(rng, 1000, 'abcd', 9) + ['abcabcab', 'abcabcabcabcX']:
+            self.assertEqual(aradix.find(word) and aradix.find(word).text, atrie.find(word) and atrie.find(word).text)
+            self.assertEqual(aradix.find_stem(word) is None, atrie.find_stem(word) is None)
+        for prefix in ('', 'a', 'abca', 'abcabcabca', 'cb', 'd'):
+            expected = atrie.autocomplete(prefix)
+            result = aradix.autocomplete(prefix)
+            self.assertEqual(result is None, expected is None)
+            if expected is not None:
+                self.assertEqual(sorted(result), sorted(expected))
+                self.assertEqual([len(w) for w in result], sorted(len(w) for w in expected))
+            for k in (1, 10, 3000):
+                self.assertEqual(aradix.autocomplete(prefix, k), atrie.autocomplete(prefix, k))
+
+    def test_frozen_trie(self):
+        """Tests that a frozen trie loaded through mmap answers queries as the original Trie"""
+        rng = random.Random(3)
+        atrie = trie.Trie()
+        words = random_words(rng, 1000, 'abcé', 7)
+        for word in words:
+            atrie.insert(word, rng.randrange(30))
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            atrie.freeze(path)
+            with frozen_trie.FrozenTrie(path) as frozen:
+                self.assertEqual(len(frozen), len(set(words)))
+                for word in random_words(rng, 500, 'abcéd', 8):
+                    self.assertEqual(word in frozen, atrie.find(word) is not None)
+                    self.assertEqual(frozen.has_prefix(word), bool(atrie.autocomplete(word)))
+                    if word in frozen:
+                        self.assertEqual(frozen.score(word), atrie.find(word).score)
+                for prefix in ('', 'a', 'é', 'bc', 'ddd'):
+                    expected = atrie.autocomplete(prefix)
+                    self.assertEqual(frozen.autocomplete(prefix) is None, expected is None)
+                    if expected is not None:
+                        self.assertEqual(sorted(frozen.autocomplete(prefix)), sorted(expected))
+                    self.assertEqual(list(frozen.iter_words(prefix)), list(atrie.iter_words(prefix, 'lex')))
+                    for k in (1, 10, 2000):
+                        self.assertEqual(frozen.autocomplete(prefix, k), atrie.autocomplete(prefix, k))
+                self.assertRaises(KeyError, frozen.score, 'dddd')
+            trie.Trie().freeze(path)
+            with frozen_trie.FrozenTrie(path) as frozen:
+                self.assertEqual(len(frozen), 0)
+                self.assertFalse('a' in frozen)
+                self.assertIsNone(frozen.autocomplete(''))
+            atrie.freeze(path)
+            with open(path, 'rb') as f:
+                content = f.read()
+            for damaged in (b'XTRI' + content[4:], content[:-1], content[:10]):
+                with open(path, 'wb') as f:
+                    f.write(damaged)
+                self.assertRaises(ValueError, frozen_trie.FrozenTrie, path)
+        finally:
+            os.remove(path)
+
+    def test_aho_corasick(self):
+        """Tests Aho-Corasick scanning (chunked and whole) against naive substring search"""
+        rng = random.Random(4)
+        atrie = trie.Trie()
+        self.assertEqual(list(aho_corasick.AhoCorasick(atrie).scan('abc')), [])
+        words = set(random_words(rng, 60, 'ab', 5)) | {'he', 'she', 'his', 'hers'}
+        for word in words:
+            atrie.insert(word)
+        automaton = aho_corasick.AhoCorasick(atrie)
+        text = ''.join(rng.choice('abhers') for _ in range(2000)) + 'ushers'
+        expected = sorted((i, w) for w in words for i in range(len(text)) if text.startswith(w, i))
+        self.assertEqual(sorted(automaton.scan(text)), expected)
+        chunks = []
+        i = 0
+        while i < len(text):
+            step = rng.randrange(1, 7)
+            chunks.append(text[i:i + step])
+            i += step
+        self.assertEqual(sorted(automaton.scan(iter(chunks))), expected)
+        self.assertEqual([m for m in automaton.scan('ushers') if m[1] in ('he', 'she', 'hers')],
+                         [(1, 'she'), (2, 'he'), (2, 'hers')])
+        atrie.delete('he')  # the compiled automaton does not see later changes to the trie
+        atrie.insert('sh')
+        self.assertEqual([m for m in automaton.scan('ushers') if m[1] in ('he', 'she', 'hers', 'sh')],
+                         [(1, 'she'), (2, 'he'), (2, 'hers')])
+        self.assertEqual([m for m in aho_corasick.AhoCorasick(atrie).scan('ushers')
+                          if m[1] in ('he', 'she', 'hers', 'sh')],
+                         [(1, 'sh'), (1, 'she'), (2, 'hers')])
+
+    def test_search_fuzzy(self):
+        """Tests the edit-distance-bounded search against brute-force Levenshtein distances"""
+
+        def distance(a, b):
+            previous = list(range(len(b) + 1))
+            for i, ca in enumerate(a, 1):
+                row = [i]
+                for j, cb in enumerate(b, 1):
+                    row.append(min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (ca != cb)))
+                previous = row
+            return previous[-1]
+
+        rng = random.Random(5)
+        atrie = trie.Trie()
+        self.assertEqual(atrie.search_fuzzy('abc', 2), [])
+        words = set(random_words(rng, 800, 'abcd', 7))
+        for word in words:
+            atrie.insert(word)
+        for query in random_words(rng, 30, 'abcde', 7) + ['']:
+            for max_distance in (0, 1, 2):
+                expected = sorted(((w, distance(query, w)) for w in words if distance(query, w) <= max_distance),
+                                  key=lambda match: (match[1], match[0]))
+                self.assertEqual(atrie.search_fuzzy(query, max_distance), expected)
+
+    def test_delete_count_and_values(self):
+        """Tests deletion with pruning, prefix counts, payloads and best scores against a dict"""
+        rng = random.Random(6)
+        atrie = trie.Trie()
+        self.assertEqual(atrie.count_prefix(''), 0)
+        self.assertIsNone(atrie.delete('abc'))
+        expected = {}
+        for _ in range(3000):
+            word = random_words(rng, 1, 'abc', 5)[0]
+            if rng.random() < 0.6:
+                score = rng.randrange(100)
+                atrie.insert(word, score, word.upper())
+                expected[word] = score
+            else:
+                node = atrie.delete(word)
+                if word in expected:
+                    self.assertEqual((node.text, node.score, node.value), (word, expected.pop(word), word.upper()))
+                else:
+                    self.assertIsNone(node)
+        for prefix in [''] + random_words(rng, 50, 'abc', 3):
+            self.assertEqual(atrie.count_prefix(prefix), sum(w.startswith(prefix) for w in expected))
+            self.assertEqual(atrie.autocomplete(prefix, 3),
+                             sorted((w for w in expected if w.startswith(prefix)), key=lambda w: (-expected[w], w))[:3])
+        for word in expected:
+            self.assertEqual(atrie.get(word), word.upper())
+        self.assertEqual(atrie.get('abcabc', 'missing'), 'missing')
+        for word in list(expected):
+            atrie.delete(word)
+        self.assertEqual(atrie.root.children, {})
+        self.assertEqual(atrie.count_prefix(''), 0)
+
+    def test_build_from_sorted(self):
+        """Tests that the bulk constructor matches word-by-word insertion"""
+        rng = random.Random(7)
+        words = sorted(random_words(rng, 1000, 'abcd', 6))
+        scores = [rng.randrange(50) for _ in words]
+        built = trie.Trie.build_from_sorted(words, scores, range(len(words)))
+        inserted = trie.Trie()
+        for word, score in zip(words, scores):
+            if inserted.find(word) is None:
+                inserted.insert(word, score)
+        self.assertEqual(list(built.iter_words(order='lex')), sorted(set(words)))
+        for prefix in ['', 'a', 'bc', 'dda', 'abcdab']:
+            self.assertEqual(built.count_prefix(prefix), inserted.count_prefix(prefix))
+            self.assertEqual(built.autocomplete(prefix, 5), inserted.autocomplete(prefix, 5))
+        self.assertEqual(built.get(words[-1]), len(words) - 1)
+        with self.assertRaises(ValueError):
+            trie.Trie.build_from_sorted(['b', 'a'])
+
+
+if __name__ == '__main__':
+    unittest.main()